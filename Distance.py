@@ -1,6 +1,50 @@
+"""
+Distance estimation from detected bounding boxes.
+
+Distance follows the pinhole model: real width * focal length / width in
+pixels. The focal length comes from a one-time checkerboard calibration
+stored in camera_calibration.npz, and the real width from a per-class table
+for the coco.names labels, so every box kept by NMS in a frame is turned
+into a distance with one NumPy expression.
+
+    python Distance.py calibrate --images "calibration/*.jpg"
+    python Distance.py calibrate           # capture checkerboard views from the camera
+    python Distance.py                     # live demo with YOLO
+"""
+import argparse
+import glob
+import os
+
 import cv2
 import numpy as np
 
+CALIBRATION_PATH = "camera_calibration.npz"
+
+# Used until the camera is calibrated: roughly a 60 degree webcam at 640 px wide
+DEFAULT_FOCAL_LENGTH = 650
+DEFAULT_IMAGE_WIDTH = 640
+
+# Typical real-world width in meters of each coco.names class, as seen from the front or side
+REAL_WIDTHS = {
+    "person": 0.45, "bicycle": 1.7, "car": 1.8, "motorbike": 0.8, "aeroplane": 35.0,
+    "bus": 2.5, "train": 3.0, "truck": 2.5, "boat": 2.5, "traffic light": 0.35,
+    "fire hydrant": 0.3, "stop sign": 0.75, "parking meter": 0.3, "bench": 1.5, "bird": 0.2,
+    "cat": 0.4, "dog": 0.6, "horse": 2.0, "sheep": 1.2, "cow": 2.0,
+    "elephant": 3.5, "bear": 1.7, "zebra": 2.2, "giraffe": 2.0, "backpack": 0.3,
+    "umbrella": 1.0, "handbag": 0.3, "tie": 0.08, "suitcase": 0.45, "frisbee": 0.25,
+    "skis": 0.1, "snowboard": 0.3, "sports ball": 0.22, "kite": 1.0, "baseball bat": 0.07,
+    "baseball glove": 0.25, "skateboard": 0.8, "surfboard": 0.55, "tennis racket": 0.3, "bottle": 0.07,
+    "wine glass": 0.08, "cup": 0.09, "fork": 0.03, "knife": 0.03, "spoon": 0.04,
+    "bowl": 0.16, "banana": 0.2, "apple": 0.08, "sandwich": 0.12, "orange": 0.08,
+    "broccoli": 0.15, "carrot": 0.2, "hot dog": 0.18, "pizza": 0.3, "donut": 0.1,
+    "cake": 0.25, "chair": 0.5, "sofa": 2.0, "pottedplant": 0.4, "bed": 1.6,
+    "diningtable": 1.5, "toilet": 0.4, "tvmonitor": 1.0, "laptop": 0.35, "mouse": 0.06,
+    "remote": 0.05, "keyboard": 0.45, "cell phone": 0.075, "microwave": 0.5, "oven": 0.6,
+    "toaster": 0.3, "sink": 0.6, "refrigerator": 0.8, "book": 0.15, "clock": 0.3,
+    "vase": 0.15, "scissors": 0.08, "teddy bear": 0.3, "hair drier": 0.2, "toothbrush": 0.02,
+}
+
+
 # Function to calculate distance
 def calculate_distance(focal_length, real_object_width, object_width_in_image):
     """
@@ -12,6 +56,8 @@ def calculate_distance(focal_length, real_object_width, object_width_in_image):
     - real_object_width: Real-world width of the object (in cm or meters)
     - object_width_in_image: Width of the object in the image (in pixels)
 
+    Works element-wise on NumPy arrays as well as on single numbers.
+
     Returns:
     - Distance to the object (in same units as real_object_width)
     """
@@ -19,57 +65,176 @@ def calculate_distance(focal_length, real_object_width, object_width_in_image):
     distance = (real_object_width * focal_length) / object_width_in_image
     return distance
 
-# Initialize the camera (use the default camera, or use an index if you have multiple cameras)
-cap = cv2.VideoCapture(0)
-
-# Focal length of the camera (in pixels) - You'll need to calibrate your camera to get this value.
-# If you don't have a specific value, you may try approximating based on the field of view of your camera.
-focal_length = 650  # Approximate value, this depends on your camera.
-
-# Real-world size of the object (in cm or meters) - This should be the width of the object you're measuring.
-real_object_width = 20  # For example, assume the object width is 20 cm.
-
-print("Press 'q' to quit the camera view.")
-
-while True:
-    # Read a frame from the camera
-    ret, frame = cap.read()
-
-    if not ret:
-        print("Failed to grab frame.")
-        break
-
-    # Show the captured frame
-    cv2.imshow("Camera", frame)
-
-    # Assume you manually detect the object using a rectangle or use a method like object detection (for simplicity)
-    # For now, we're using a hard-coded bounding box (you should replace it with your own detection logic).
-    # Here, we're using the coordinates of the object in the frame (for example, a red object).
-    # Define the region of interest (ROI) in the image where the object is
-    # You can replace this with an actual object detection algorithm (like contour detection or an object recognition model)
-   
-    # Example: Hard-code the bounding box coordinates of the object
-    x, y, w, h = 200, 150, 50, 30  # Example bounding box (you can replace this with actual detection)
-   
-    # Draw the bounding box (just for visual reference)
-    cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
-   
-    # Calculate the object width in the image (in pixels)
-    object_width_in_image = w
-   
-    # Calculate the distance using the object width in the image
-    if object_width_in_image > 0:
-        distance = calculate_distance(focal_length, real_object_width, object_width_in_image)
-        cv2.putText(frame, f"Distance: {distance:.2f} cm", (x, y - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-
-    # Show the updated frame with the distance
-    cv2.imshow("Distance Calculation", frame)
-
-    # Exit if the user presses the 'q' key
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
-
-# Release the camera and close the OpenCV windows
-cap.release()
-cv2.destroyAllWindows()
+
+def calibrate(images, pattern=(9, 6), square_size=0.025, path=CALIBRATION_PATH):
+    """
+    Compute camera intrinsics from checkerboard views and save them.
+
+    :param images: Grey or BGR images of the same size showing the checkerboard.
+    :param pattern: Inner corners per row and column.
+    :param square_size: Side of one square in meters.
+    :return: Tuple (camera_matrix, dist_coeffs, image_size), or None when no view had a full checkerboard.
+    """
+    grid = np.zeros((pattern[0] * pattern[1], 3), np.float32)
+    grid[:, :2] = np.mgrid[0:pattern[0], 0:pattern[1]].T.reshape(-1, 2) * square_size
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+
+    object_points, image_points, image_size = [], [], None
+    for image in images:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        found, corners = cv2.findChessboardCorners(gray, pattern)
+        if not found:
+            continue
+        image_size = gray.shape[::-1]
+        object_points.append(grid)
+        image_points.append(cv2.cornerSubPix(gray, corners, (11, 11), (-1, -1), criteria))
+    if not object_points:
+        return None
+
+    error, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(object_points, image_points, image_size, None, None)
+    np.savez(path, camera_matrix=camera_matrix, dist_coeffs=dist_coeffs, image_size=np.array(image_size))
+    print(f"Calibrated from {len(object_points)} views, reprojection error {error:.3f} px; saved to {path}")
+    return camera_matrix, dist_coeffs, image_size
+
+
+def load_calibration(path=CALIBRATION_PATH):
+    """
+    Read the stored intrinsics.
+    :return: Tuple (focal_length in pixels, image width it applies to).
+    """
+    if not os.path.exists(path):
+        print(f"No camera calibration at {path}; using an approximate focal length.")
+        return DEFAULT_FOCAL_LENGTH, DEFAULT_IMAGE_WIDTH
+    calibration = np.load(path)
+    return float(calibration["camera_matrix"][0, 0]), int(calibration["image_size"][0])
+
+
+class DistanceEstimator:
+    """
+    Per-class distance estimates for whole arrays of boxes.
+
+    :param classes: Class names in model order (coco.names).
+    :param calibration_path: Intrinsics written by calibrate().
+    """
+
+    def __init__(self, classes, calibration_path=CALIBRATION_PATH):
+        self.classes = classes
+        self.focal_length, self.image_width = load_calibration(calibration_path)
+        # Classes missing from the table get NaN, which propagates to their distances
+        self.widths = np.array([REAL_WIDTHS.get(name, np.nan) for name in classes], dtype=np.float32)
+
+    def estimate(self, boxes, class_ids, frame_width):
+        """
+        Distances in meters for x, y, w, h boxes.
+        :param frame_width: Width of the frame the boxes come from; the focal
+            length is rescaled if it differs from the calibrated resolution.
+        :return: float32 array with one distance per box.
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        focal_length = self.focal_length * frame_width / self.image_width
+        return calculate_distance(focal_length, self.widths[np.asarray(class_ids, dtype=np.intp)],
+                                  np.maximum(boxes[:, 2], 1.0))
+
+    def describe(self, boxes, class_ids, frame_width):
+        """Spoken summary such as "person 2 m ahead on your left, chair 1.5 m ahead"."""
+        boxes = np.asarray(boxes).reshape(-1, 4)
+        if len(boxes) == 0:
+            return ""
+        distances = self.estimate(boxes, class_ids, frame_width)
+        # Below 3 m half meters matter; further away whole meters are enough
+        rounded = np.where(distances < 3, np.maximum(np.round(distances * 2) / 2, 0.5), np.round(distances))
+        center_x = boxes[:, 0] + boxes[:, 2] / 2
+        directions = np.select([center_x < frame_width / 3, center_x > 2 * frame_width / 3],
+                               [" on your left", " on your right"], "")
+        return ", ".join(f"{self.classes[class_id]} {distance:g} m ahead{direction}"
+                         if np.isfinite(distance) else f"{self.classes[class_id]}{direction}"
+                         for class_id, distance, direction in zip(class_ids, rounded.tolist(), directions))
+
+
+def capture_calibration_views(pattern, views=15):
+    """Collect checkerboard views from the camera; press space to keep a view, 'q' to finish."""
+    cap = cv2.VideoCapture(0)
+    images = []
+    print(f"Show the {pattern[0]}x{pattern[1]} checkerboard; space keeps a view, 'q' finishes.")
+    while len(images) < views:
+        ret, frame = cap.read()
+        if not ret:
+            print("Failed to grab frame.")
+            break
+        found, corners = cv2.findChessboardCorners(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), pattern)
+        preview = frame.copy()
+        cv2.drawChessboardCorners(preview, pattern, corners, found)
+        cv2.putText(preview, f"{len(images)}/{views} views", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        cv2.imshow("Calibration", preview)
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord(' ') and found:
+            images.append(frame)
+        elif key == ord('q'):
+            break
+    cap.release()
+    cv2.destroyAllWindows()
+    return images
+
+
+def demo():
+    from detection import Detector
+
+    detector = Detector()
+    estimator = DistanceEstimator(detector.classes)
+
+    # Initialize the camera (use the default camera, or use an index if you have multiple cameras)
+    cap = cv2.VideoCapture(0)
+    print("Press 'q' to quit the camera view.")
+
+    while True:
+        # Read a frame from the camera
+        ret, frame = cap.read()
+        if not ret:
+            print("Failed to grab frame.")
+            break
+
+        # Every box kept by NMS gets its distance in one call
+        boxes, confidences, class_ids = detector.detect(frame)
+        distances = estimator.estimate(boxes, class_ids, frame.shape[1])
+        for (x, y, w, h), class_id, distance in zip(boxes.tolist(), class_ids, distances.tolist()):
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            cv2.putText(frame, f"{detector.classes[class_id]} {distance:.1f} m", (x, y - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+
+        # Show the updated frame with the distances
+        cv2.imshow("Distance Calculation", frame)
+
+        # Exit if the user presses the 'q' key
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            print(estimator.describe(boxes, class_ids, frame.shape[1]))
+            break
+
+    # Release the camera and close the OpenCV windows
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", nargs="?", default="demo", choices=["demo", "calibrate"])
+    parser.add_argument("--images", help="glob of checkerboard photos; the camera is used when omitted")
+    parser.add_argument("--pattern", type=int, nargs=2, default=(9, 6), help="inner corners per row and column")
+    parser.add_argument("--square-size", type=float, default=0.025, help="checkerboard square side in meters")
+    args = parser.parse_args()
+
+    if args.command == "demo":
+        demo()
+        return
+
+    pattern = tuple(args.pattern)
+    if args.images:
+        images = [cv2.imread(path) for path in sorted(glob.glob(args.images))]
+        images = [image for image in images if image is not None]
+    else:
+        images = capture_calibration_views(pattern)
+    if calibrate(images, pattern, args.square_size) is None:
+        print("No checkerboard found; calibration not saved.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import streamlit as st
 from streamlit_webrtc import webrtc_streamer
 import webbrowser
+import os
 
 def main():
     # Set page configuration
@@ -44,7 +45,13 @@ def main():
     if app_mode == "Camera":
         st.header("Camera Stream")
         st.write("Use your camera directly from this app.")
-        webrtc_streamer(key="camera")
+        # With the YOLO files present, frames run through the shared detection pipeline
+        if all(os.path.exists(file) for file in ['yolov4-tiny.weights', 'yolov4-tiny.cfg', 'coco.names']):
+            from webrtc_processor import processor_factory
+            webrtc_streamer(key="camera", video_processor_factory=processor_factory(),
+                            media_stream_constraints={"video": True, "audio": False}, async_processing=True)
+        else:
+            webrtc_streamer(key="camera")
 
     elif app_mode == "Open Webpage":
         st.header("Open a Webpage")
@@ -1,18 +1,15 @@
 import streamlit as st
 from streamlit_option_menu import option_menu
-import pyttsx3
+import speech
 import speech_recognition as sr
 import os
 
 # Initialize the text-to-speech engine
-engine = pyttsx3.init()
-engine.setProperty("rate", 150)  # Set speaking rate
-engine.setProperty("volume", 1.0)  # Set volume
+speech.get_service(rate=150, volume=1.0)  # Set speaking rate and volume
 
 # Function to speak text
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    speech.say(text, wait=True)
 
 # Function to process voice commands
 def listen_command():
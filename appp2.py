@@ -1,19 +1,20 @@
 import streamlit as st
 import cv2
-import numpy as np
-import pyttsx3
 import os
 import time
-import mediapipe as mp
-import pandas as pd
-from sklearn.neighbors import KNeighborsClassifier
 from streamlit_webrtc import webrtc_streamer
-from PIL import Image
-import pytesseract
+import metrics
+import models
+import speech
+from detection import Detector
+import queue
 
 def camera_app():
-    # Initialize text-to-speech engine
-    engine = pyttsx3.init()
+    input_size = st.sidebar.selectbox("YOLO input size", Detector.INPUT_SIZES, index=1,
+                                      help="Smaller inputs are faster on CPU-only machines.")
+    overlay = st.sidebar.checkbox("Show stage timings", help="Draw per-stage milliseconds on the video.")
+    if overlay:
+        metrics.enable()
 
     # Load YOLO model
     required_files = ['yolov4-tiny.weights', 'yolov4-tiny.cfg', 'coco.names']
@@ -21,144 +22,42 @@ def camera_app():
         st.error("Required YOLO files are missing!")
         return
 
-    net = cv2.dnn.readNet('yolov4-tiny.weights', 'yolov4-tiny.cfg')
-    net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
-    net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
-
-    with open("coco.names", "r") as f:
-        classes = [line.strip() for line in f.readlines()]
-    colors = np.random.uniform(0, 255, size=(len(classes), 3))
-
-    # Load facial expression dataset and train KNN
-    dataset_path = "facial_expression_data_new.csv"
-    data = pd.read_csv(dataset_path)
-    X = data.iloc[:, :-1].values
-    y = data.iloc[:, -1].values
-    knn = KNeighborsClassifier(n_neighbors=3)
-    knn.fit(X, y)
-
-    # Initialize MediaPipe Pose and Face Mesh
-    mp_pose = mp.solutions.pose
-    pose = mp_pose.Pose()
-    mp_drawing = mp.solutions.drawing_utils
-    mp_face_mesh = mp.solutions.face_mesh
-    face_mesh = mp_face_mesh.FaceMesh(refine_landmarks=False, max_num_faces=1)
-
-    # Function to calculate distance
-    def calculate_distance(area, K=1000):
-        return K / np.sqrt(area) if area > 0 else float('inf')
-
-    # Function to infer action
-    def infer_action(landmarks):
-        left_hand = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_hand = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        nose = landmarks[mp_pose.PoseLandmark.NOSE.value]
-        if left_hand.y < nose.y and right_hand.y < nose.y:
-            return "Hands raised"
-        elif left_hand.y > nose.y and right_hand.y > nose.y:
-            return "Hands lowered"
-        return "Neutral position"
-
-    # Real-time video capture
-    def process_frame():
-        cap = cv2.VideoCapture(0)
-        last_person_detected_time = 0
-        detection_interval = 10  # Detect YOLO objects every 10 seconds
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            height, width, _ = frame.shape
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # Real-time Pose Estimation
-            pose_results = pose.process(rgb_frame)
-            if pose_results.pose_landmarks:
-                mp_drawing.draw_landmarks(frame, pose_results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-                action = infer_action(pose_results.pose_landmarks.landmark)
-                cv2.putText(frame, f"Action: {action}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-
-            # Real-time Distance Calculation
-            if pose_results.pose_landmarks:
-                nose = pose_results.pose_landmarks.landmark[mp_pose.PoseLandmark.NOSE]
-                if nose.visibility > 0.5:
-                    area = 10000  # Example fixed area
-                    distance = calculate_distance(area)
-                    cv2.putText(frame, f"Distance: {distance:.2f} cm", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-            # Real-time Facial Expression Recognition
-            face_results = face_mesh.process(rgb_frame)
-            if face_results.multi_face_landmarks:
-                for face_landmarks in face_results.multi_face_landmarks:
-                    landmarks = [lm.x for lm in face_landmarks.landmark] + [lm.y for lm in face_landmarks.landmark]
-                    expression = knn.predict([landmarks])[0]
-                    cv2.putText(frame, f"Expression: {expression}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-            # YOLO Object Detection every 10 seconds
-            current_time = time.time()
-            if current_time - last_person_detected_time > detection_interval:
-                last_person_detected_time = current_time
-                blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
-                net.setInput(blob)
-                outputs = net.forward([net.getLayerNames()[i - 1] for i in net.getUnconnectedOutLayers()])
-                boxes, confidences, class_ids = [], [], []
-                for output in outputs:
-                    for detection in output:
-                        scores = detection[5:]
-                        class_id = np.argmax(scores)
-                        confidence = scores[class_id]
-                        if confidence > 0.5:
-                            center_x, center_y, w, h = (detection[0:4] * [width, height, width, height]).astype(int)
-                            x, y = int(center_x - w / 2), int(center_y - h / 2)
-                            boxes.append([x, y, w, h])
-                            confidences.append(float(confidence))
-                            class_ids.append(class_id)
-                indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
-
-                detected_objects = []
-                if len(indexes) > 0:
-                    for i in indexes.flatten():
-                        x, y, w, h = boxes[i]
-                        label = str(classes[class_ids[i]])
-                        if label == "person":
-                            color = colors[class_ids[i]]
-                            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-                            cv2.putText(frame, f"{label}", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-                            detected_objects.append(label)
-
-                # Provide feedback through TTS
-                if "person" in detected_objects:
-                    engine.say("Person detected")
-                    engine.runAndWait()
-
-            # Show real-time output
-            cv2.imshow("Real-Time Detection", frame)
-
-            # Exit on ESC key
-            if cv2.waitKey(1) == 27:
-                break
-
-        cap.release()
-        cv2.destroyAllWindows()
-
-    if st.button("Start Camera Stream"):
-        st.write("Starting camera...")
-        process_frame()
+    # Load the shared models in the background while the page renders; they live in the
+    # process-wide registry, so reruns and other sessions reuse them instead of reloading
+    models.warm_up(("yolo", (input_size,)), "expression", "distance")
+    speak = st.sidebar.checkbox("Speak feedback on this computer", value=True)
+
+    # Frames come from the browser; every session gets its own processor
+    from webrtc_processor import processor_factory
+    ctx = webrtc_streamer(key="camera", video_processor_factory=processor_factory(input_size, overlay),
+                          media_stream_constraints={"video": True, "audio": False}, async_processing=True)
+
+    # Show (and optionally speak) feedback about newly tracked people while the stream plays
+    feedback = st.empty()
+    announced = None
+    while ctx.state.playing:
+        processor = ctx.video_processor
+        text = processor.last_announcement if processor is not None else None
+        if text and text != announced:
+            announced = text
+            feedback.write(text)
+            if speak:
+                speech.say(text, key="person")
+        time.sleep(0.5)
 
 def ocr_app():
+    from ocr_stream import StreamingOCR
     st.title("OCR App")
     st.write("This app extracts text from the camera feed in real-time.")
+    streaming = st.checkbox("Read text continuously",
+                            help="Find and read new text in the background instead of waiting for 's'.")
 
     def speak(text):
-        engine = pyttsx3.init()
-        engine.say(text)
-        engine.runAndWait()
+        speech.say(text, key="ocr")
 
     def read_text_from_frame(frame):
         gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        pil_image = Image.fromarray(gray_frame)
-        text = pytesseract.image_to_string(pil_image)
+        text = models.get("ocr").recognize(gray_frame)
         return text
 
     def process_ocr():
@@ -167,6 +66,12 @@ def ocr_app():
             st.error("Error: Could not open camera.")
             return
 
+        # Streamlit calls must stay on this thread, so the worker only queues new text and errors
+        new_text = queue.Queue()
+        errors = queue.Queue()
+        reported_errors = set()
+        ocr = StreamingOCR(on_text=new_text.put, on_error=errors.put).start() if streaming else None
+
         while True:
             ret, frame = cap.read()
             if not ret:
@@ -174,6 +79,19 @@ def ocr_app():
                 break
 
             frame_resized = cv2.resize(frame, (640, 480))
+            if ocr is not None:
+                ocr.submit(frame_resized.copy())
+                for (x, y, w, h), _ in ocr.regions:
+                    cv2.rectangle(frame_resized, (x, y), (x + w, y + h), (0, 255, 0), 2)
+                while not new_text.empty():
+                    text = new_text.get()
+                    st.write(f"Recognized Text: {text}")
+                    speech.say(text)
+                while not errors.empty():
+                    error = repr(errors.get())
+                    if error not in reported_errors:
+                        reported_errors.add(error)
+                        st.warning(f"Text recognition failed: {error}")
             cv2.imshow("Camera - Text Recognition", frame_resized)
 
             key = cv2.waitKey(1) & 0xFF
@@ -189,6 +107,8 @@ def ocr_app():
             elif key == ord('q'):
                 break
 
+        if ocr is not None:
+            ocr.stop()
         cap.release()
         cv2.destroyAllWindows()
 
@@ -199,6 +119,8 @@ def ocr_app():
 if __name__ == "__main__":
     st.set_page_config(page_title="Camera and OCR App", layout="wide")
     st.title("Real-Time Camera and OCR App")
+    # METRICS_PORT=9100 serves per-stage timings in Prometheus format
+    metrics.configure()
 
     app_mode = st.sidebar.selectbox("Choose the app mode", ["Camera", "OCR"])
 
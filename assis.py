@@ -1,20 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
 from PIL import Image, ImageTk
-import pyttsx3
+import speech
 import speech_recognition as sr
 import requests
 from io import BytesIO
 
 # Initialize text-to-speech engine
-engine = pyttsx3.init()
-engine.setProperty("rate", 150)
-engine.setProperty("volume", 1.0)
+speech.get_service(rate=150, volume=1.0)
 
 # Helper functions
 def speak(text):
-    engine.say(text)
-    engine.runAndWait()
+    speech.say(text, wait=True)
 
 def listen_command():
     recognizer = sr.Recognizer()
@@ -1,22 +1,25 @@
 import streamlit as st
-import pyttsx3
 import speech_recognition as sr
-from threading import Thread
 from datetime import datetime
-import time
+
+import metrics
+import speech
+from intents import IntentIndex
+from reminder_store import ReminderStore
+from reminders import ReminderScheduler
+from response_store import ResponseStore
+from routing import RoadGraph
 
 # Initialize Text-to-Speech Engine
-engine = pyttsx3.init()
-engine.setProperty('rate', 150)
+speech.get_service(rate=150)
 
 # Initialize speech recognition
 recognizer = sr.Recognizer()
 
 # Speak function
 def speak(text):
-    """Convert text to speech."""
-    engine.say(text)
-    engine.runAndWait()
+    """Convert text to speech and wait until it has been spoken."""
+    speech.say(text, wait=True)
 
 # Listen function
 def listen():
@@ -24,8 +27,10 @@ def listen():
     try:
         with sr.Microphone() as source:
             st.info("Listening...")
-            audio = recognizer.listen(source, timeout=10)
-            command = recognizer.recognize_google(audio)
+            with metrics.timer("listen"):
+                audio = recognizer.listen(source, timeout=10)
+            with metrics.timer("recognize"):
+                command = recognizer.recognize_google(audio)
             st.success(f"You said: {command}")
             return command.lower()
     except sr.UnknownValueError:
@@ -35,89 +40,68 @@ def listen():
         speak("Microphone or recognition service is not working. Please check.")
         return None
 
-# Locations and Routes
-locations = {
-    "malviya nagar": "A residential and commercial area in Jaipur.",
-    "vaishali nagar": "A posh locality in Jaipur known for its vibrant markets.",
-    "tonk road": "A major road connecting various parts of Jaipur.",
-    "ajmer road": "A highway leading to Ajmer from Jaipur.",
-    "delhi": "The capital city of India.",
-    "jaipur": "The Pink City and the capital of Rajasthan.",
-    "niwai": "A small town near Jaipur.",
-    "banasthali vidyapith": "A renowned women's university near Tonk."
-}
-
-routes = {
-    ("delhi", "jaipur"): [
-        "Start from Delhi.",
-        "Take NH48 and continue on the Jaipur-Delhi Highway.",
-        "Drive for approximately 260 kilometers.",
-        "Follow signs for Jaipur and take the exit towards the city center.",
-        "You have arrived in Jaipur."
-    ],
-    ("niwai", "jaipur"): [
-        "Start from Niwai.",
-        "Take the NH52 road towards Jaipur.",
-        "Continue straight for about 65 kilometers.",
-        "Enter Jaipur via Tonk Road.",
-        "You have arrived in Jaipur."
-    ],
-    ("banasthali vidyapith", "delhi"): [
-        "Start from Banasthali Vidyapith.",
-        "Head towards Tonk and join NH52.",
-        "Drive north to Jaipur and merge onto NH48.",
-        "Continue on NH48 towards Delhi for approximately 260 kilometers.",
-        "You have arrived in Delhi."
-    ]
-}
+# Commands; anything else is answered from default_responses.json and what the user has taught.
+# With only a few phrases every shared word weighs a lot, so fuzzy command matches must be close.
+COMMANDS = IntentIndex({
+    "navigate": "navigate",
+    "give me directions": "navigate",
+    "set a reminder": "reminder",
+    "remind me": "reminder",
+    "reminder": "reminder",
+    "exit": "exit",
+    "goodbye": "exit",
+    "stop listening": "exit",
+}, min_score=0.75)
+
+def command_action(command):
+    """The control command a request asks for, or None to answer it from the responses."""
+    # Exact response phrases ("teach me", "remember this") come before fuzzy commands
+    if responses.exact_match(command):
+        return None
+    return COMMANDS.respond(command)
+
+# Road network around Jaipur; the places are the nodes of roads.csv
+road_graph = RoadGraph.load()
 
 # Reminders
-reminders = []
+def announce_reminder(reminder):
+    """Scheduler callback: speak a reminder when it is due."""
+    speech.say(f"Reminder: {reminder.task}", priority=speech.URGENT)
+    st.write(f"Reminder: {reminder.task}")
+
+# Streamlit reruns this script on every interaction; the stores and the scheduler thread are built once
+@st.cache_resource
+def load_stores():
+    """Taught responses and the reminder scheduler (reminders.db survives a restart), shared by every rerun."""
+    scheduler = ReminderScheduler(announce_reminder, store=ReminderStore())
+    # Background thread that sleeps until the next reminder is due
+    scheduler.start()
+    return ResponseStore(), scheduler
+
+responses, scheduler = load_stores()
 
 def add_reminder(time_input, task):
     """Add a reminder."""
     time_obj = datetime.strptime(time_input, "%H:%M")
-    reminder_minutes = time_obj.hour * 60 + time_obj.minute
-    reminders.append({"time": reminder_minutes, "task": task})
+    scheduler.at(task, time_obj.hour, time_obj.minute)
     speak(f"Reminder added for {task} at {time_input}.")
     return f"Reminder added for {task} at {time_input}."
 
-def check_reminders():
-    """Thread function to check reminders."""
-    notified_tasks = set()
-    while True:
-        now = datetime.now()
-        current_minutes = now.hour * 60 + now.minute
-        for reminder in reminders:
-            if current_minutes == reminder["time"] and reminder["time"] not in notified_tasks:
-                speak(f"Reminder: {reminder['task']}")
-                st.write(f"Reminder: {reminder['task']}")
-                notified_tasks.add(reminder["time"])
-        time.sleep(30)
-
 def navigate(start, destination):
     """Provide navigation instructions."""
-    if start not in locations or destination not in locations:
-        speak("Sorry, I couldn't find one of the locations you mentioned.")
+    steps = road_graph.directions(start, destination)
+    if steps is None:
+        speak("Sorry, I couldn't find a route between the places you mentioned.")
         return
 
-    route = routes.get((start, destination))
-    if not route:
-        speak(f"Sorry, I don't have a predefined route from {start} to {destination}.")
-        return
-
-    speak(f"Starting navigation from {start.capitalize()} to {destination.capitalize()}.")
-    for step in route:
+    for step in steps:
         speak(step)
         st.write(step)
-    speak(f"You have arrived at {destination.capitalize()}.")
 
 def main():
     st.title("Voice-Based Navigation and Reminder System")
-
-    # Background thread to check reminders
-    reminder_thread = Thread(target=check_reminders, daemon=True)
-    reminder_thread.start()
+    # METRICS_PORT=9100 serves listen, recognize and TTS timings in Prometheus format
+    metrics.configure()
 
     st.header("Voice Commands")
     st.write("Use voice commands to control the system.")
@@ -130,7 +114,9 @@ def main():
         if command is None:
             continue
 
-        if "navigate" in command:
+        action = command_action(command)
+
+        if action == "navigate":
             speak("Please tell me your starting location.")
             start = listen()
             if not start:
@@ -140,7 +126,7 @@ def main():
             if start and destination:
                 navigate(start.lower(), destination.lower())
 
-        elif "reminder" in command:
+        elif action == "reminder":
             speak("Please tell me the time for the reminder in HH:MM format.")
             time_input = listen()
             if not time_input:
@@ -154,12 +140,26 @@ def main():
                 except ValueError:
                     speak("Invalid time format. Please try again.")
 
-        elif "exit" in command:
+        elif action == "exit":
             speak("Goodbye!")
+            responses.close()
+            scheduler.stop()
+            scheduler.store.close()
+            # The next run opens fresh stores instead of reusing the closed ones
+            load_stores.clear()
             break
 
         else:
-            speak("Sorry, I didn't understand that. Please try again.")
+            answer = responses.respond(command)
+            if answer:
+                st.write(answer)
+                speak(answer)
+                continue
+            speak("I don't know that yet. Tell me what I should say, or say skip.")
+            answer = listen()
+            if answer and answer != "skip":
+                responses.teach(command, answer)
+                speak("Thank you, I will remember that.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+"""
+Microbenchmark: vectorized YOLO decoding against the per-detection loop.
+
+Record real network outputs once, then compare both decoders on them:
+    python bench_decode.py --record some_frame.jpg --outputs outputs.npz
+    python bench_decode.py --outputs outputs.npz
+Without --outputs, synthetic yolov4-tiny shaped outputs are used.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from detection import decode_outputs
+
+WIDTH, HEIGHT = 640, 480
+
+
+def legacy_decode(outputs, width, height):
+    """The original per-row loop from camera_integrated.py."""
+    boxes, confidences, class_ids = [], [], []
+    for output in outputs:
+        for detection in output:
+            scores = detection[5:]
+            class_id = np.argmax(scores)
+            confidence = scores[class_id]
+            if confidence > 0.5:
+                center_x, center_y, w, h = (detection[0:4] * [width, height, width, height]).astype(int)
+                x = int(center_x - w / 2)
+                y = int(center_y - h / 2)
+                boxes.append([x, y, w, h])
+                confidences.append(float(confidence))
+                class_ids.append(class_id)
+    indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
+    return [boxes[i] for i in np.asarray(indexes).reshape(-1)]
+
+
+def record_outputs(image_path, path):
+    net = cv2.dnn.readNet('yolov4-tiny.weights', 'yolov4-tiny.cfg')
+    frame = cv2.imread(image_path)
+    blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
+    net.setInput(blob)
+    outputs = net.forward([net.getLayerNames()[i - 1] for i in net.getUnconnectedOutLayers()])
+    np.savez(path, *outputs, size=np.array(frame.shape[:2]))
+    print(f"Saved {len(outputs)} output heads to {path}")
+
+
+def synthetic_outputs(seed=0):
+    """yolov4-tiny at 416x416: a 13x13 and a 26x26 head, 3 anchors each, 80 classes."""
+    rng = np.random.default_rng(seed)
+    outputs = []
+    for rows in (13 * 13 * 3, 26 * 26 * 3):
+        output = rng.random((rows, 85), dtype=np.float32)
+        output[:, 5:] *= 0.3
+        hits = rng.choice(rows, size=rows // 100, replace=False)
+        output[hits, 5 + rng.integers(0, 80, size=len(hits))] = rng.uniform(0.5, 1.0, size=len(hits))
+        outputs.append(output)
+    return outputs
+
+
+def timeit(func, repeat):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return 1000 * (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--outputs", help="npz file of recorded network outputs")
+    parser.add_argument("--record", metavar="IMAGE", help="run the network on IMAGE and save its outputs")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.record:
+        record_outputs(args.record, args.outputs or "outputs.npz")
+        return
+
+    height, width = HEIGHT, WIDTH
+    if args.outputs:
+        data = np.load(args.outputs)
+        outputs = [data[f"arr_{i}"] for i in range(len(data.files) - 1)]
+        height, width = data["size"]
+    else:
+        outputs = synthetic_outputs()
+
+    rows = sum(len(output) for output in outputs)
+    kept_legacy = len(legacy_decode(outputs, width, height))
+    kept_vector = len(decode_outputs(outputs, width, height)[0])
+    print(f"{rows} rows, kept {kept_legacy} (loop) / {kept_vector} (vectorized)")
+
+    loop_ms = timeit(lambda: legacy_decode(outputs, width, height), args.repeat)
+    vector_ms = timeit(lambda: decode_outputs(outputs, width, height), args.repeat)
+    person_ms = timeit(lambda: decode_outputs(outputs, width, height, allowed_classes=[0]), args.repeat)
+    print(f"per-row loop:          {loop_ms:8.3f} ms/frame")
+    print(f"vectorized:            {vector_ms:8.3f} ms/frame ({loop_ms / vector_ms:.1f}x)")
+    print(f"vectorized, person:    {person_ms:8.3f} ms/frame ({loop_ms / person_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
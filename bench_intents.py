@@ -0,0 +1,116 @@
+"""
+Benchmark: intent matching over a large synthetic phrase table.
+
+Builds --intents phrase -> response pairs from a small vocabulary (the
+default_responses.json intents are included), then times IntentIndex on
+exact phrases and on noisy versions of them: a filler word and a
+misspelt word, as speech recognition produces. A linear
+difflib scan, the obvious implementation without an index, is timed on a
+few queries for comparison.
+
+    python bench_intents.py --intents 10000 --queries 2000
+"""
+import argparse
+import difflib
+import json
+import random
+import time
+
+import numpy as np
+
+from intents import RESPONSES_PATH, IntentIndex, normalize
+
+VERBS = ["open", "close", "read", "find", "call", "play", "show", "start", "stop", "check", "send", "turn on",
+         "turn off", "set", "describe", "navigate to", "tell me about", "remind me about", "search for", "share"]
+OBJECTS = ["settings", "messages", "camera", "music", "weather", "alarm", "contacts", "news", "battery", "calendar",
+           "email", "notes", "map", "radio", "timer", "gallery", "downloads", "wifi", "bluetooth", "flashlight",
+           "volume", "keyboard", "bus stop", "pharmacy", "hospital", "station", "market", "library", "doctor",
+           "family", "friend", "teacher", "bank", "temple", "office", "school", "park", "shop", "taxi", "train"]
+MODIFIERS = ["", "now", "please", "for me", "today", "tomorrow", "again", "quickly", "nearby", "at home",
+             "in the morning", "tonight", "this week", "on my phone", "out loud"]
+FILLERS = ["please", "can you", "hey", "um", "could you"]
+
+
+def synthetic_table(count, seed=0):
+    with open(RESPONSES_PATH, "r") as f:
+        table = json.load(f)
+    rng = random.Random(seed)
+    while len(table) < count:
+        phrase = " ".join(part for part in (rng.choice(VERBS), rng.choice(OBJECTS), rng.choice(MODIFIERS),
+                                            rng.choice(OBJECTS) if rng.random() < 0.3 else "") if part)
+        table.setdefault(phrase, f"Response to '{phrase}' at {{current_time}}.")
+    return table
+
+
+def garble(phrase, rng):
+    """A rewording that keeps the intent recognizable."""
+    words = phrase.split()
+    if rng.random() < 0.5:
+        words.insert(0, rng.choice(FILLERS))
+    candidates = [i for i, word in enumerate(words) if len(word) > 4]
+    if candidates:
+        i = rng.choice(candidates)
+        word = words[i]
+        j = rng.randrange(1, len(word) - 1)
+        words[i] = word[:j] + word[j + 1:] if rng.random() < 0.5 else word[:j] + word[j] + word[j:]
+    return " ".join(words)
+
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return results, 1e6 * (time.perf_counter() - start) / len(queries)
+
+
+def accuracy(matches, expected):
+    """A match counts when it is the expected phrase or one that normalizes to the same text."""
+    return np.mean([match is not None and normalize(match) == normalize(target)
+                    for match, target in zip(matches, expected)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--intents", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--difflib-queries", type=int, default=20, help="0 skips the linear difflib baseline")
+    parser.add_argument("--save", help="write the synthetic table to this JSON file")
+    args = parser.parse_args()
+
+    table = synthetic_table(args.intents)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(table, f, indent=1)
+
+    start = time.perf_counter()
+    index = IntentIndex(table)
+    print(f"{len(table)} intents indexed in {1000 * (time.perf_counter() - start):.0f} ms, "
+          f"{len(index.feature_index)} features")
+
+    rng = random.Random(1)
+    phrases = list(table)
+    exact = [rng.choice(phrases) for _ in range(args.queries)]
+    noisy = [garble(phrase, rng) for phrase in exact]
+
+    matches, per_query = time_queries(lambda query: index.match(query)[0], exact)
+    print(f"exact:  {per_query:7.1f} us/query, accuracy {accuracy(matches, exact):.1%}")
+    matches, per_query = time_queries(lambda query: index.match(query)[0], noisy)
+    print(f"fuzzy:  {per_query:7.1f} us/query, accuracy {accuracy(matches, exact):.1%}")
+    _, per_query = time_queries(lambda query: index.respond(query), noisy)
+    print(f"respond:{per_query:7.1f} us/query (match + template fill)")
+
+    if args.difflib_queries:
+        normalized = [normalize(phrase) for phrase in phrases]
+        lookup = dict(zip(normalized, phrases))
+
+        def linear(query):
+            found = difflib.get_close_matches(normalize(query), normalized, n=1, cutoff=0.6)
+            return lookup[found[0]] if found else None
+
+        subset = slice(0, args.difflib_queries)
+        matches, per_query = time_queries(linear, noisy[subset])
+        print(f"difflib:{per_query:7.1f} us/query, accuracy {accuracy(matches, exact[subset]):.1%} "
+              f"(linear scan, {args.difflib_queries} queries)")
+
+
+if __name__ == "__main__":
+    main()
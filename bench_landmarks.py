@@ -0,0 +1,87 @@
+"""
+Benchmark: per-frame landmark extraction, Python lists against LandmarkArray.
+
+Uses synthetic MediaPipe landmark lists (33 pose landmarks with visibility,
+468 face landmarks without) and reports time and bytes allocated per frame.
+
+    python bench_landmarks.py --repeat 2000
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+from landmarks import FACE_LANDMARKS, POSE_LANDMARKS, LandmarkArray, infer_action
+
+
+def synthetic_list(count, visibility, seed):
+    rng = np.random.default_rng(seed)
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in rng.random((count, 3)):
+        lm = landmark_list.landmark.add(x=x, y=y, z=z)
+        if visibility:
+            lm.visibility = 0.9
+    return landmark_list
+
+
+def list_path(pose, face):
+    """The per-frame code the camera apps used before the adapter."""
+    landmarks = pose.landmark
+    nose, left, right = landmarks[0], landmarks[15], landmarks[16]
+    action = "Hands raised" if left.y < nose.y and right.y < nose.y else "other"
+    interleaved = []
+    for lm in face.landmark:
+        interleaved.extend([lm.x, lm.y])
+    planar = [lm.x for lm in face.landmark] + [lm.y for lm in face.landmark]
+    return action, np.asarray(interleaved, dtype=np.float32), np.asarray(planar, dtype=np.float32)
+
+
+def make_array_path():
+    pose_array = LandmarkArray(POSE_LANDMARKS)
+    face_array = LandmarkArray(FACE_LANDMARKS)
+
+    def array_path(pose, face):
+        action = infer_action(pose_array.fill(pose))
+        face_array.fill(face)
+        # xy_features reuses one buffer, so keep a copy of the first layout for the comparison
+        return action, face_array.xy_features("interleaved").copy(), face_array.xy_features("planar")
+    return array_path
+
+
+def measure(func, pose, face, repeat):
+    func(pose, face)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(pose, face)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    func(pose, face)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return 1e6 * elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    pose = synthetic_list(POSE_LANDMARKS, True, 0)
+    face = synthetic_list(FACE_LANDMARKS, False, 1)
+
+    array_path = make_array_path()
+    expected, got = list_path(pose, face), array_path(pose, face)
+    assert np.allclose(expected[1], got[1]) and np.allclose(expected[2], got[2])
+
+    list_us, list_bytes = measure(list_path, pose, face, args.repeat)
+    array_us, array_bytes = measure(array_path, pose, face, args.repeat)
+    print(f"python lists:   {list_us:8.1f} us/frame, {list_bytes:7d} bytes allocated")
+    print(f"LandmarkArray:  {array_us:8.1f} us/frame, {array_bytes:7d} bytes allocated "
+          f"({list_us / array_us:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
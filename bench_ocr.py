@@ -0,0 +1,73 @@
+"""
+Benchmark: OCR crops per second, pytesseract against TesseractPool.
+
+Renders synthetic text-line crops (or cuts them from --image with the
+streaming OCR's region finder) and OCRs them one by one through
+pytesseract.image_to_string, then as parallel batches on the pool.
+
+    python bench_ocr.py --crops 64 --workers 4
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+import pytesseract
+
+from ocr_pool import TesseractPool
+from ocr_stream import find_text_regions
+
+WORDS = ["EXIT", "PLATFORM 2", "Pharmacy", "Bus stop", "No entry", "Gate 5", "Open 9 to 5", "Push"]
+
+
+def synthetic_crops(count):
+    crops = []
+    for i in range(count):
+        text = WORDS[i % len(WORDS)]
+        crop = np.full((48, 24 * len(text) + 20), 255, dtype=np.uint8)
+        cv2.putText(crop, text, (10, 34), cv2.FONT_HERSHEY_SIMPLEX, 1.0, 0, 2, cv2.LINE_AA)
+        crops.append(crop)
+    return crops
+
+
+def image_crops(path, count):
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise SystemExit(f"Could not read {path}")
+    crops = [gray[y:y + h, x:x + w] for x, y, w, h in find_text_regions(gray, max_regions=count)]
+    if not crops:
+        raise SystemExit(f"No text regions found in {path}")
+    return (crops * (count // len(crops) + 1))[:count]
+
+
+def measure(func, crops):
+    start = time.perf_counter()
+    texts = func(crops)
+    return len(crops) / (time.perf_counter() - start), texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--crops", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--image", default=None, help="Cut crops from this image instead of rendering them.")
+    args = parser.parse_args()
+
+    crops = image_crops(args.image, args.crops) if args.image else synthetic_crops(args.crops)
+
+    baseline, expected = measure(lambda batch: [pytesseract.image_to_string(crop, config="--psm 7")
+                                                for crop in batch], crops)
+    print(f"pytesseract:          {baseline:7.1f} crops/s")
+
+    with TesseractPool(workers=args.workers, psm=7) as pool:
+        pool.recognize(crops[0])  # warm up
+        pooled, texts = measure(pool.recognize_batch, crops)
+        print(f"TesseractPool ({pool.backend}, {pool.workers} workers): {pooled:7.1f} crops/s "
+              f"({pooled / baseline:.1f}x)")
+
+    agree = sum(a.strip() == b.strip() for a, b in zip(expected, texts))
+    print(f"identical text on {agree}/{len(crops)} crops")
+
+
+if __name__ == "__main__":
+    main()
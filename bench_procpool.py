@@ -0,0 +1,94 @@
+"""
+Benchmark: single-process model loop against the process-pool sharding.
+
+Runs the pose, face (with expression KNN) and YOLO families over the same
+frames twice - sequentially in this process, then concurrently in one
+worker process per family - and reports end-to-end latency, throughput and
+per-core CPU utilisation for each run.
+
+    python bench_procpool.py --video clip.mp4 --frames 200
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from procpool import FAMILIES, ProcessModelPool
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def read_frames(source, count):
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"Could not read any frames from {source!r}.")
+    return frames
+
+
+def run_single(frames, families, options):
+    runners = [FAMILIES[family](options) for family in families]
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        for run in runners:
+            run(frame)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_pool(frames, families, options):
+    with ProcessModelPool(families, options=options) as pool, ThreadPoolExecutor(len(families)) as executor:
+        latencies = []
+        for frame in frames:
+            start = time.perf_counter()
+            handle = pool.write(frame)
+            list(executor.map(lambda family: pool.run(family, handle), families))
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+
+def measure(name, func, *args):
+    if psutil is not None:
+        psutil.cpu_percent(percpu=True)
+    latencies = np.array(func(*args)[1:]) * 1000  # first frame includes warm-up
+    cores = psutil.cpu_percent(percpu=True) if psutil is not None else None
+
+    print(f"{name}:")
+    print(f"  latency p50 {np.percentile(latencies, 50):.1f} ms, p95 {np.percentile(latencies, 95):.1f} ms, "
+          f"mean {latencies.mean():.1f} ms")
+    print(f"  throughput {1000 / latencies.mean():.1f} fps")
+    if cores is not None:
+        print("  per-core utilisation: " + " ".join(f"{load:.0f}%" for load in cores))
+    else:
+        print("  per-core utilisation: install psutil to report it")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default="0", help="video file or camera index")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--input-size", type=int, default=416)
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    options = {"input_size": args.input_size}
+    print(f"{len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}, families: {', '.join(args.families)}")
+    measure("single process", run_single, frames, args.families, options)
+    measure("process pool", run_pool, frames, args.families, options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: route queries on a synthetic city-sized road graph.
+
+Builds a jittered grid of --nodes junctions with roads to the neighbouring
+junctions (a share of them removed, lengths stretched at random so roads
+are not straight lines), then answers the same random queries with plain
+Dijkstra and with ALT A* and checks that both find equally short routes.
+Reports the landmark precomputation time, milliseconds and settled nodes
+per query, and the time for repeated, cached queries.
+
+    python bench_routing.py --nodes 100000 --landmarks 16 --queries 200
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from routing import RoadGraph
+
+
+def synthetic_graph(nodes, drop=0.15, seed=0):
+    """:return: (names, edges) for RoadGraph."""
+    rng = np.random.default_rng(seed)
+    side = int(math.ceil(math.sqrt(nodes)))
+    xy = np.stack(np.meshgrid(np.arange(side), np.arange(side), indexing="ij"), -1).reshape(-1, 2)[:nodes]
+    xy = xy + rng.uniform(-0.3, 0.3, xy.shape)
+    edges = []
+    for offset, valid in ((side, lambda i: i + side < nodes), (1, lambda i: (i + 1) % side and i + 1 < nodes)):
+        for i in range(nodes):
+            if valid(i) and rng.random() >= drop:
+                j = i + offset
+                length = float(np.hypot(*(xy[i] - xy[j])) * rng.uniform(1.0, 1.4))
+                edges.append((i, j, length, f"road {len(edges) % 500}"))
+    return [f"junction {i}" for i in range(nodes)], edges
+
+
+def run(graph, pairs, active_landmarks):
+    settled, distances = [], []
+    start = time.perf_counter()
+    for source, target in pairs:
+        route = graph._search(source, target, active_landmarks)
+        settled.append(graph.last_settled)
+        distances.append(route.distance if route else math.inf)
+    return 1000 * (time.perf_counter() - start) / len(pairs), np.mean(settled), distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--landmarks", type=int, default=16)
+    parser.add_argument("--active", type=int, default=4, help="landmarks consulted per query")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    names, edges = synthetic_graph(args.nodes)
+    start = time.perf_counter()
+    graph = RoadGraph(names, edges, landmarks=args.landmarks)
+    print(f"{args.nodes} nodes, {len(edges)} roads; {len(graph.landmarks)} landmarks precomputed in "
+          f"{time.perf_counter() - start:.1f} s")
+
+    rng = np.random.default_rng(1)
+    pairs = [tuple(int(node) for node in rng.integers(0, args.nodes, 2)) for _ in range(args.queries)]
+    dijkstra_ms, dijkstra_settled, expected = run(graph, pairs, 0)
+    print(f"dijkstra: {dijkstra_ms:7.2f} ms/query, {dijkstra_settled:8.0f} nodes settled")
+    alt_ms, alt_settled, found = run(graph, pairs, args.active)
+    print(f"ALT A*:   {alt_ms:7.2f} ms/query, {alt_settled:8.0f} nodes settled ({dijkstra_ms / alt_ms:.1f}x faster)")
+    mismatches = sum(not math.isclose(a, b, rel_tol=1e-9) for a, b in zip(expected, found) if math.isfinite(a))
+    print(f"routes differing in length from dijkstra: {mismatches}")
+
+    for source, target in pairs:
+        graph.shortest_path(source, target)
+    start = time.perf_counter()
+    for source, target in pairs:
+        graph.shortest_path(source, target)
+    print(f"cached:   {1e6 * (time.perf_counter() - start) / len(pairs):7.2f} us/query")
+
+
+if __name__ == "__main__":
+    main()
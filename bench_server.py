@@ -0,0 +1,95 @@
+"""
+Benchmark: load generator for inference_server.py.
+
+Starts --clients concurrent clients that each send --requests frames over
+HTTP or WebSocket, waiting for every answer before sending the next frame,
+and reports throughput, latency percentiles and the server's mean batch
+size. Run the server with --max-batch 1 to compare against unbatched
+inference.
+
+    python inference_server.py &
+    python bench_server.py --clients 8 --requests 50 --mode ws
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+import cv2
+import numpy as np
+
+
+def test_frame(path=None):
+    if path:
+        frame = cv2.imread(path)
+        if frame is None:
+            raise SystemExit(f"Could not read {path}")
+        return frame
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+
+async def http_client(session, url, body, params, count, latencies):
+    for _ in range(count):
+        start = time.perf_counter()
+        async with session.post(f"{url}/infer", data=body, params=params,
+                                headers={"Content-Type": "image/jpeg"}) as response:
+            response.raise_for_status()
+            await response.json()
+        latencies.append(time.perf_counter() - start)
+
+
+async def ws_client(session, url, body, params, count, latencies):
+    async with session.ws_connect(f"{url}/ws", params=params, max_msg_size=0) as ws:
+        for _ in range(count):
+            start = time.perf_counter()
+            await ws.send_bytes(body)
+            await ws.receive_str()
+            latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    _, encoded = cv2.imencode(".jpg", test_frame(args.image), [cv2.IMWRITE_JPEG_QUALITY, 85])
+    body = encoded.tobytes()
+    params = {"models": args.models} if args.models else {}
+    client = ws_client if args.mode == "ws" else http_client
+
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{args.url}/stats") as response:
+            before = await response.json()
+        # One warm-up request so model start-up is not measured
+        await client(session, args.url, body, params, 1, [])
+
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(client(session, args.url, body, params, args.requests, latencies)
+                               for _ in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+        async with session.get(f"{args.url}/stats") as response:
+            after = await response.json()
+
+    latencies = 1000 * np.asarray(latencies)
+    requests = after["requests"] - before["requests"] - 1
+    batches = after["batches"] - before["batches"] - 1
+    print(f"{args.clients} {args.mode} clients x {args.requests} requests: {len(latencies) / elapsed:.1f} frames/s")
+    print(f"latency p50 {np.percentile(latencies, 50):.1f} / p95 {np.percentile(latencies, 95):.1f} / "
+          f"p99 {np.percentile(latencies, 99):.1f} ms")
+    if batches > 0:
+        print(f"server: {requests} frames in {batches} batches ({requests / batches:.1f} frames per forward pass)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=50, help="frames per client")
+    parser.add_argument("--mode", choices=["http", "ws"], default="http")
+    parser.add_argument("--models", help="comma-separated subset of yolo,pose,face")
+    parser.add_argument("--image", help="frame to send; random noise when omitted")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark: end-to-end vision pipelines on recorded clips, without a display.
+
+Replays each clip (a video file or an image directory, see capture.py)
+through the camera_integrated.py pipeline and the Streamlit camera app's
+per-frame pipeline, and reports throughput, frame latency percentiles and
+per-model time. Speech is muted.
+
+    python capture.py record clips/street.mp4 --seconds 20
+    python bench_vision.py clips/street.mp4 --frames 300 --json results.json
+    python bench_vision.py clips/street.mp4 --baseline results.json   # non-zero exit on regression
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+import speech
+from capture import open_capture, parse_rate
+
+PIPELINES = ("integrated", "app")
+
+
+def summarize(latencies, timings, frames, elapsed, dropped=0):
+    latencies = 1000 * np.asarray(latencies or [0.0])
+    result = {
+        "frames": frames,
+        "dropped": dropped,
+        "fps": frames / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "models": {},
+    }
+    for name, samples in timings.items():
+        times = 1000 * np.asarray(samples or [0.0])
+        result["models"][name] = {"runs": len(samples), "mean_ms": float(times.mean()),
+                                  "p95_ms": float(np.percentile(times, 95))}
+    return result
+
+
+def run_integrated(clip, args):
+    """camera_integrated.py: threaded FramePipeline with the compositor, as its main() runs it."""
+    import camera_integrated
+    from Distance import DistanceEstimator
+    from detection import load_classes
+    from pipeline import FramePipeline
+    from tracker import ObjectTracker
+
+    classes = load_classes("coco.names")
+    colors = np.random.uniform(0, 255, size=(len(classes), 3))
+    estimator = DistanceEstimator(classes)
+    tracker = ObjectTracker()
+    prepare, stages = camera_integrated.load_local_stages(args.input_size)
+
+    # Time the models themselves, inside the scheduler, so skipped runs are not counted
+    timings = {name: [] for name in stages}
+
+    def timed_stage(name, stage):
+        def run(packet):
+            start = time.perf_counter()
+            result = stage(packet)
+            timings[name].append(time.perf_counter() - start)
+            return result
+        return run
+
+    stages = {name: timed_stage(name, stage) for name, stage in stages.items()}
+    if not args.every_frame:
+        prepare, stages = camera_integrated.schedule_models(prepare, stages, tracker)
+
+    cap = open_capture(clip, fps=parse_rate(args.fps))
+    pipeline = FramePipeline(cap, stages, prepare=prepare)
+    latencies = []
+    start = time.perf_counter()
+    with pipeline:
+        while len(latencies) < args.frames:
+            item = pipeline.get()
+            if item is None:
+                if not pipeline.is_running():
+                    break
+                continue
+            packet, results = item
+            if "yolo" in packet.views.get("ran", ("yolo",)):
+                tracker.update(*results["yolo"])
+            else:
+                tracker.predict()
+            camera_integrated.compose(packet.image, results, tracker, classes, colors, estimator)
+            latencies.append(time.perf_counter() - packet.captured_at)
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return summarize(latencies, timings, len(latencies), elapsed, pipeline.capture_stats.dropped)
+
+
+def run_app(clip, args):
+    """The Streamlit camera app's sequential per-frame pipeline."""
+    from camera_app_pipeline import MODELS, CameraAppPipeline
+
+    app = CameraAppPipeline(input_size=args.input_size, every_frame=args.every_frame)
+    timings = {name: [] for name in MODELS}
+    cap = open_capture(clip, fps=parse_rate(args.fps))
+    latencies = []
+    start = time.perf_counter()
+    while len(latencies) < args.frames:
+        frame_start = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        for name in app.process(frame):
+            timings[name].append(app.scheduler.models[name].last_elapsed)
+        latencies.append(time.perf_counter() - frame_start)
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return summarize(latencies, timings, len(latencies), elapsed)
+
+
+RUNNERS = {"integrated": run_integrated, "app": run_app}
+
+
+def print_result(pipeline, clip, result):
+    print(f"{pipeline:10s} {clip}: {result['frames']} frames, {result['fps']:.1f} fps, "
+          f"latency p50 {result['p50_ms']:.1f} / p95 {result['p95_ms']:.1f} / p99 {result['p99_ms']:.1f} ms"
+          + (f", {result['dropped']} frames dropped" if result["dropped"] else ""))
+    for name, model in result["models"].items():
+        print(f"    {name:5s} {model['runs']:5d} runs, mean {model['mean_ms']:6.1f} ms, p95 {model['p95_ms']:6.1f} ms")
+
+
+def regressions(results, baseline, tolerance):
+    """Messages for every pipeline/clip whose fps fell or p95 latency rose by more than tolerance."""
+    problems = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if result["fps"] < before["fps"] * (1 - tolerance):
+            problems.append(f"{key}: {result['fps']:.1f} fps, baseline {before['fps']:.1f}")
+        if result["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            problems.append(f"{key}: p95 {result['p95_ms']:.1f} ms, baseline {before['p95_ms']:.1f}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clips", nargs="+", help="video files or image directories")
+    parser.add_argument("--pipelines", nargs="+", default=list(PIPELINES), choices=PIPELINES)
+    parser.add_argument("--frames", type=int, default=300, help="stop each run after this many output frames")
+    parser.add_argument("--fps", default="native",
+                        help="replay rate: native, max, or frames per second; with max the threaded pipeline "
+                             "drops whatever frames it cannot keep up with")
+    parser.add_argument("--input-size", type=int, default=416)
+    parser.add_argument("--every-frame", action="store_true", help="disable model scheduling")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative regression")
+    args = parser.parse_args()
+
+    speech.mute()
+    results = {}
+    for clip in args.clips:
+        for pipeline in args.pipelines:
+            result = RUNNERS[pipeline](clip, args)
+            results[f"{pipeline}:{clip}"] = result
+            print_result(pipeline, clip, result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = regressions(results, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
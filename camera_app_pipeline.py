@@ -0,0 +1,135 @@
+"""
+Per-frame processing of the Streamlit camera app, independent of Streamlit.
+
+CameraAppPipeline takes its models from the process-wide registry in
+models.py and keeps only per-stream state (scheduler, tracker, landmark
+buffers), so creating one on every Streamlit rerun is cheap. It turns each
+BGR frame into an annotated frame, so the same code serves the app,
+headless replays and bench_vision.py.
+"""
+import cv2
+import mediapipe as mp
+import numpy as np
+
+import metrics
+import models
+import speech
+from detection import class_ids_for
+from frame_scheduler import DetectionScheduler
+from landmarks import FACE_LANDMARKS, NOSE, POSE_LANDMARKS, LandmarkArray, infer_action
+from tracker import ObjectTracker
+
+mp_pose = mp.solutions.pose
+mp_drawing = mp.solutions.drawing_utils
+
+MODELS = ("pose", "face", "yolo")
+
+
+class CameraAppPipeline:
+    """
+    Pose, expression and person detection with distances and spoken feedback.
+
+    :param input_size: YOLO input resolution.
+    :param detection_interval: Run YOLO at least this often in seconds, sooner when the scene changes.
+    :param every_frame: Run every model on every frame instead of scheduling them.
+    :param pose: MediaPipe Pose to use instead of the shared one; Pose and FaceMesh
+        track landmarks from frame to frame, so concurrent streams each need their own.
+    :param face_mesh: MediaPipe FaceMesh to use instead of the shared one.
+    :param speak: Announce new people through the speech service; the latest
+        announcement is kept in last_announcement either way.
+    """
+
+    def __init__(self, input_size=416, detection_interval=10, every_frame=False, pose=None, face_mesh=None,
+                 speak=True):
+        self.detector = models.get("yolo", input_size)
+        self.classes = self.detector.classes
+        self.colors = np.random.uniform(0, 255, size=(len(self.classes), 3))
+        self.person_ids = class_ids_for(self.classes, ["person"])
+        self.estimator = models.get("distance")
+
+        # Prebuilt facial expression model (built from the CSV on first run)
+        self.knn = models.get("expression")
+
+        # MediaPipe Pose and Face Mesh
+        self.pose = pose or models.get("pose")
+        self.face_mesh = face_mesh or models.get("face_mesh")
+        self.speak = speak
+        self.last_announcement = None
+
+        self.every_frame = every_frame
+        self.scheduler = DetectionScheduler(frame_budget=1 / 15)
+        self.scheduler.add_model("pose", priority=0).add_model("face", priority=1)
+        self.scheduler.add_model("yolo", priority=2, max_interval=detection_interval, on_motion=True)
+        self.tracker = ObjectTracker()
+        self.pose_points = LandmarkArray(POSE_LANDMARKS)
+        self.face_points = LandmarkArray(FACE_LANDMARKS)
+
+    def process(self, frame):
+        """
+        Run the planned models on one BGR frame and draw their results onto it.
+        :return: Set of the model names that ran; their times are in scheduler.models[name].last_elapsed.
+        """
+        scheduler, tracker = self.scheduler, self.tracker
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        plan = scheduler.plan(frame, tracker.confident())
+        if self.every_frame:
+            plan = set(MODELS)
+
+        # Real-time Pose Estimation
+        pose_results = None
+        if "pose" in plan:
+            with scheduler.timed("pose"), metrics.timer("pose"):
+                pose_results = self.pose.process(rgb_frame)
+        points = None
+        if pose_results and pose_results.pose_landmarks:
+            mp_drawing.draw_landmarks(frame, pose_results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+            points = self.pose_points.fill(pose_results.pose_landmarks)
+            action = infer_action(points)
+            cv2.putText(frame, f"Action: {action}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+
+        # Real-time Facial Expression Recognition
+        face_results = None
+        if "face" in plan:
+            with scheduler.timed("face"), metrics.timer("face"):
+                face_results = self.face_mesh.process(rgb_frame)
+        if face_results and face_results.multi_face_landmarks:
+            for face_landmarks in face_results.multi_face_landmarks:
+                self.face_points.fill(face_landmarks)
+                expression = self.knn.predict(self.face_points.xy_features("planar"))
+                cv2.putText(frame, f"Expression: {expression}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+        # YOLO Object Detection on scene change or tracker loss, at least every detection_interval;
+        # in between, the tracker carries the last boxes forward
+        if "yolo" in plan:
+            with scheduler.timed("yolo"):
+                boxes, confidences, class_ids = self.detector.detect(frame, allowed_classes=self.person_ids)
+            tracker.update(boxes, confidences, class_ids)
+        else:
+            tracker.predict()
+
+        # Real-time Distance Calculation for every tracked person at once
+        with metrics.timer("draw"):
+            self._draw_tracks(frame, points)
+
+        # Provide feedback through TTS once per newly tracked person
+        if tracker.new_tracks:
+            new_boxes = np.array([track.box for track in tracker.new_tracks])
+            new_class_ids = [track.class_id for track in tracker.new_tracks]
+            self.last_announcement = self.estimator.describe(new_boxes, new_class_ids, frame.shape[1])
+            if self.speak:
+                speech.say(self.last_announcement, key="person")
+        return plan
+
+    def _draw_tracks(self, frame, points):
+        boxes, _, class_ids, track_ids = self.tracker.arrays()
+        distances = self.estimator.estimate(boxes, class_ids, frame.shape[1])
+        for (x, y, w, h), class_id, track_id, distance in zip(boxes.tolist(), class_ids, track_ids,
+                                                              distances.tolist()):
+            label = str(self.classes[class_id])
+            color = self.colors[class_id]
+            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+            cv2.putText(frame, f"{label} {track_id} {distance:.1f} m", (x, y - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+        if points is not None and points[NOSE, 3] > 0.5 and len(distances):
+            cv2.putText(frame, f"Distance: {distances.min():.2f} m", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1,
+                        (0, 255, 0), 2)
@@ -1,154 +1,256 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-import pandas as pd
-from sklearn.neighbors import KNeighborsClassifier
-import pyttsx3
+import argparse
 import os
+from types import SimpleNamespace
 
-# Initialize text-to-speech engine
-engine = pyttsx3.init()
+import metrics
+import models
+import speech
+from Distance import DistanceEstimator
+from capture import open_capture, open_sink, parse_rate
+from cascade import FaceCascade, to_frame_coords
+from detection import Detector, load_classes
+from frame_scheduler import DetectionScheduler, schedule_stages
+from landmarks import FACE_LANDMARKS, NOSE, POSE_LANDMARKS, LandmarkArray, infer_action
+from pipeline import FramePipeline
+from procpool import ProcessModelPool, face_result, pose_result
+from tracker import ObjectTracker
 
-# Constants for distance calculation
-K = 1000
+mp_pose = mp.solutions.pose
+mp_drawing = mp.solutions.drawing_utils
 
-# Load YOLO model
-required_files = ['yolov4-tiny.weights', 'yolov4-tiny.cfg', 'coco.names']
-if not all(os.path.exists(file) for file in required_files):
-    print("Required YOLO files are missing!")
-    exit(1)
+# Pose landmarks are unpacked on the compositor thread only, so one buffer serves every frame
+pose_points = LandmarkArray(POSE_LANDMARKS)
 
-net = cv2.dnn.readNet('yolov4-tiny.weights', 'yolov4-tiny.cfg')
-net.setPreferableBackend(cv2.dnn.DNN_BACKEND_CUDA)
-net.setPreferableTarget(cv2.dnn.DNN_TARGET_CUDA)
+NO_POSE = SimpleNamespace(pose_landmarks=None)
+NO_FACE = (SimpleNamespace(multi_face_landmarks=None), [])
 
-# Load class labels for YOLO
-with open("coco.names", "r") as f:
-    classes = [line.strip() for line in f.readlines()]
-colors = np.random.uniform(0, 255, size=(len(classes), 3))
+# Target model time per frame in ms
+FRAME_BUDGET = 66
 
-# Load facial expression dataset
-dataset_path = "facial_expression_data_new.csv"
-data = pd.read_csv(dataset_path)
-X = data.iloc[:, :-1].values
-y = data.iloc[:, -1].values
-knn = KNeighborsClassifier(n_neighbors=3)
-knn.fit(X, y)
 
-# Initialize MediaPipe Pose and Face Mesh
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-mp_drawing = mp.solutions.drawing_utils
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(refine_landmarks=False, max_num_faces=1)
-
-
-# Function to infer action from pose
-def infer_action(landmarks):
-    if landmarks:
-        left_hand = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-        right_hand = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
-        nose = landmarks[mp_pose.PoseLandmark.NOSE.value]
-        if left_hand.y < nose.y and right_hand.y < nose.y:
-            return "Hands raised"
-        elif left_hand.y > nose.y and right_hand.y > nose.y:
-            return "Hands lowered"
-        else:
-            return "Neutral position"
-    return "No action detected"
-
-# Start video capture
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("Error: Could not open webcam.")
-    exit()
-
-try:
-    while True:
-        # Read a frame from the camera
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame.")
-            break
-
-        height, width, _ = frame.shape
-
-        # Convert frame to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # MediaPipe Pose and Face Mesh
-        pose_results = pose.process(rgb_frame)
-        face_results = face_mesh.process(rgb_frame)
-
-        # YOLO Object Detection
-        blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
-        net.setInput(blob)
-        outputs = net.forward([net.getLayerNames()[i - 1] for i in net.getUnconnectedOutLayers()])
-
-        boxes, confidences, class_ids = [], [], []
-        for output in outputs:
-            for detection in output:
-                scores = detection[5:]
-                class_id = np.argmax(scores)
-                confidence = scores[class_id]
-                if confidence > 0.5:
-                    center_x, center_y, w, h = (detection[0:4] * [width, height, width, height]).astype(int)
-                    x = int(center_x - w / 2)
-                    y = int(center_y - h / 2)
-                    boxes.append([x, y, w, h])
-                    confidences.append(float(confidence))
-                    class_ids.append(class_id)
-
-        indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
-
-        # Display detected objects and calculate feedback
-        detected_objects = []
-        if len(indexes) > 0:
-            for i in indexes.flatten():
-                x, y, w, h = boxes[i]
-                label = str(classes[class_ids[i]])
-                confidence = confidences[i]
-                color = colors[class_ids[i]]
-                cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-                cv2.putText(frame, f"{label} {confidence:.2f}", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
-                detected_objects.append((label, x + w // 2))
-
-        if detected_objects:
-            feedback = []
-            for label, center_x in detected_objects:
-                direction = "left" if center_x < width // 3 else "right" if center_x > 2 * width // 3 else "center"
-                feedback.append(f"{label} on your {direction}")
-            description = ", ".join(feedback)
-            engine.say(description)
-            engine.runAndWait()
-
-        # Pose Landmarks and Distance
-        if pose_results.pose_landmarks:
-            mp_drawing.draw_landmarks(frame, pose_results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-            landmarks = pose_results.pose_landmarks.landmark
-            nose = landmarks[mp_pose.PoseLandmark.NOSE]
-            if nose.visibility > 0.5:
-                distance = isinstance(center_x, x)
-                cv2.putText(frame, f"Distance: {distance:.2f} cm", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-            action = infer_action(landmarks)
-            cv2.putText(frame, f"Action: {action}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
-
-        # Face Mesh and Expression Detection
-        if face_results.multi_face_landmarks:
-            for face_landmarks in face_results.multi_face_landmarks:
-                landmarks = []
-                for lm in face_landmarks.landmark:
-                    landmarks.extend([lm.x, lm.y])
-                expression = knn.predict([landmarks])[0]
-                cv2.putText(frame, f"Expression: {expression}", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-
-        # Display the frame
-        cv2.imshow("Integrated Detection", frame)
-
-        # Exit on 'q' key press
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-finally:
-    cap.release()
-    cv2.destroyAllWindows()
-    engine.stop()
+def load_local_stages(input_size, cascade=None):
+    """
+    Load every model in this process; each stage runs on its own pipeline thread.
+    :param cascade: Optional FaceCascade; pose then only runs while a person is
+        present and FaceMesh only on the face crop it provides.
+    """
+    detector = models.get("yolo", input_size)
+
+    # Load the prebuilt facial expression model (built from the CSV on first run)
+    knn = models.get("expression")
+
+    # Initialize MediaPipe Pose and Face Mesh
+    pose = models.get("pose")
+    face_mesh = models.get("face_mesh")
+    face_points = LandmarkArray(FACE_LANDMARKS)
+
+    def prepare_frame(packet):
+        packet.views["rgb"] = cv2.cvtColor(packet.image, cv2.COLOR_BGR2RGB)
+
+    def pose_stage(packet):
+        if cascade is not None and not cascade.person_present():
+            return NO_POSE
+        with metrics.timer("pose"):
+            return pose.process(packet.views["rgb"])
+
+    def face_stage(packet):
+        roi = None
+        if cascade is not None:
+            crop, roi = cascade.crop(packet.views["rgb"])
+            if crop is None:
+                return NO_FACE
+        with metrics.timer("face"):
+            face_results = face_mesh.process(crop if roi is not None else packet.views["rgb"])
+        expressions = []
+        with metrics.timer("expression"):
+            for face_landmarks in face_results.multi_face_landmarks or []:
+                points = face_points.fill(face_landmarks)
+                if roi is not None:
+                    height, width = packet.image.shape[:2]
+                    to_frame_coords(points, roi, width, height)
+                expressions.append(knn.predict(face_points.xy_features("interleaved")))
+        return face_results, expressions
+
+    def yolo_stage(packet):
+        return detector.detect(packet.image, conf_threshold=0.5, nms_threshold=0.4)
+
+    return prepare_frame, {"pose": pose_stage, "face": face_stage, "yolo": yolo_stage}
+
+
+def load_worker_stages(pool):
+    """Stages that hand each frame to the pool's worker processes through shared memory."""
+    def prepare_shared_frame(packet):
+        packet.views["shared"] = pool.write(packet.image)
+
+    def pose_stage(packet):
+        return pose_result(pool.run("pose", packet.views["shared"]))
+
+    def face_stage(packet):
+        return face_result(pool.run("face", packet.views["shared"]))
+
+    def yolo_stage(packet):
+        return pool.run("yolo", packet.views["shared"])
+
+    return prepare_shared_frame, {"pose": pose_stage, "face": face_stage, "yolo": yolo_stage}
+
+
+def schedule_models(prepare, stages, tracker, frame_budget=FRAME_BUDGET):
+    """
+    Put the stages behind the detection scheduler: pose and face first, YOLO on
+    scene change, tracker loss or once a second.
+    :param frame_budget: Model time per frame in ms.
+    :return: (prepare, stages) for FramePipeline.
+    """
+    scheduler = DetectionScheduler(frame_budget=frame_budget / 1000, concurrent=True)
+    scheduler.add_model("pose", priority=0).add_model("face", priority=1)
+    scheduler.add_model("yolo", priority=2, max_interval=1.0, on_motion=True)
+    return schedule_stages(scheduler, prepare, stages, tracker_confident=tracker.confident)
+
+
+@metrics.timed("draw")
+def compose(frame, results, tracker, classes, colors, estimator, cascade=None):
+    """Draw the merged stage results for one frame and give spoken feedback."""
+    height, width, _ = frame.shape
+    pose_results = results["pose"]
+    face_results, expressions = results["face"]
+
+    # Display tracked objects with their distances; only objects seen for the first time are announced
+    boxes, _, class_ids, track_ids = tracker.arrays()
+    distances = estimator.estimate(boxes, class_ids, width)
+    for (x, y, w, h), class_id, track_id, distance in zip(boxes.tolist(), class_ids, track_ids, distances.tolist()):
+        label = str(classes[class_id])
+        color = colors[class_id]
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+        cv2.putText(frame, f"{label} {track_id} {distance:.1f} m", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+    if tracker.new_tracks:
+        new_boxes = np.array([track.box for track in tracker.new_tracks])
+        new_class_ids = [track.class_id for track in tracker.new_tracks]
+        speech.say(estimator.describe(new_boxes, new_class_ids, width), key="objects")
+
+    # Pose Landmarks and the distance of the nearest tracked person
+    points = None
+    if pose_results.pose_landmarks:
+        mp_drawing.draw_landmarks(frame, pose_results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
+        points = pose_points.fill(pose_results.pose_landmarks)
+        people = distances[class_ids == estimator.classes.index("person")]
+        if points[NOSE, 3] > 0.5 and len(people):
+            cv2.putText(frame, f"Distance: {people.min():.2f} m", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        action = infer_action(points)
+        cv2.putText(frame, f"Action: {action}", (10, 70), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+
+    # Face Mesh and Expression Detection
+    if face_results.multi_face_landmarks:
+        for expression in expressions:
+            cv2.putText(frame, f"Expression: {expression}", (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+    # Tell the cascade where people and faces were, for the stages working on the next frames
+    if cascade is not None:
+        cascade.publish(frame.shape, class_ids, boxes, points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Integrated pose, expression and object detection.")
+    parser.add_argument("--input-size", type=int, default=416, choices=Detector.INPUT_SIZES,
+                        help="YOLO input resolution; smaller is faster on CPU-only machines")
+    parser.add_argument("--processes", action="store_true",
+                        help="run pose, face and YOLO in separate worker processes")
+    parser.add_argument("--frame-budget", type=float, default=FRAME_BUDGET,
+                        help="target model time per frame in ms; YOLO runs only on scene change or when stale")
+    parser.add_argument("--every-frame", action="store_true", help="run every model on every frame")
+    parser.add_argument("--cascade", action="store_true",
+                        help="run pose only when a person is present and FaceMesh only on the face crop")
+    parser.add_argument("--source", default="0", help="camera index, video file or image directory")
+    parser.add_argument("--fps", default="native",
+                        help="replay rate for recordings: native, max, or frames per second")
+    parser.add_argument("--headless", action="store_true", help="no preview window")
+    parser.add_argument("--record", help="with --headless, write the annotated frames to this video file")
+    parser.add_argument("--mute", action="store_true", help="skip spoken feedback")
+    parser.add_argument("--metrics-port", type=int,
+                        help="record per-stage timings and serve them in Prometheus format on this port")
+    parser.add_argument("--overlay", action="store_true", help="draw per-stage milliseconds on the frame")
+    args = parser.parse_args()
+    if args.cascade and args.processes:
+        parser.error("--cascade runs in-process and cannot be combined with --processes")
+
+    # Load YOLO model
+    required_files = ['yolov4-tiny.weights', 'yolov4-tiny.cfg', 'coco.names']
+    if not all(os.path.exists(file) for file in required_files):
+        print("Required YOLO files are missing!")
+        exit(1)
+
+    classes = load_classes("coco.names")
+    colors = np.random.uniform(0, 255, size=(len(classes), 3))
+
+    cascade = FaceCascade(person_class_id=classes.index("person")) if args.cascade else None
+    pool = None
+    if args.processes:
+        pool = ProcessModelPool(("pose", "face", "yolo"), options={"input_size": args.input_size})
+        prepare, stages = load_worker_stages(pool)
+    else:
+        prepare, stages = load_local_stages(args.input_size, cascade)
+
+    tracker = ObjectTracker()
+    estimator = DistanceEstimator(classes)
+    if not args.every_frame:
+        prepare, stages = schedule_models(prepare, stages, tracker, args.frame_budget)
+
+    if args.mute:
+        speech.mute()
+    if args.metrics_port or args.overlay:
+        metrics.enable(args.metrics_port)
+
+    # Start video capture
+    cap = open_capture(args.source, fps=parse_rate(args.fps))
+    sink = open_sink(args.headless, args.record)
+    if not cap.isOpened():
+        print(f"Error: Could not open video source {args.source}.")
+        exit()
+
+    # With worker processes, keep one more shared slot than frames in flight
+    # so a slot is never overwritten while a worker is reading it
+    max_in_flight = pool.slots - 1 if pool is not None else 2
+    pipeline = FramePipeline(cap, stages, prepare=prepare, max_in_flight=max_in_flight)
+
+    try:
+        pipeline.start()
+        while True:
+            item = pipeline.get()
+            if item is None:
+                if not pipeline.is_running():
+                    print("Error: Could not read frame." if args.source.isdigit() else "End of recording.")
+                    break
+                continue
+
+            packet, results = item
+            frame = packet.image
+            if "yolo" in packet.views.get("ran", ("yolo",)):
+                tracker.update(*results["yolo"])
+            else:
+                tracker.predict()
+            compose(frame, results, tracker, classes, colors, estimator, cascade)
+            if args.overlay:
+                metrics.draw_overlay(frame)
+
+            # Display the frame
+            sink.show("Integrated Detection", frame)
+
+            # Exit on 'q' key press
+            if sink.poll_key() == ord('q'):
+                break
+    finally:
+        pipeline.stop()
+        print(pipeline.report())
+        cap.release()
+        sink.close()
+        if not args.mute:
+            speech.get_service().stop()
+        if pool is not None:
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Frame sources and sinks that can stand in for a camera and a window.
+
+open_capture() returns a cv2.VideoCapture-style source for a camera index,
+a video file or a directory of images; recordings can be replayed at their
+own rate, a fixed rate, or as fast as frames can be decoded. WindowSink
+wraps cv2.imshow/waitKey and HeadlessSink replaces them on machines without
+a display, optionally writing the annotated frames to a video file.
+
+    python capture.py record clips/street.mp4 --seconds 20
+"""
+import argparse
+import os
+import time
+
+import cv2
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class Pacer:
+    """Sleeps just long enough to deliver frames at a fixed rate; fps=None never sleeps."""
+
+    def __init__(self, fps=None):
+        self.interval = 1.0 / fps if fps else 0.0
+        self._next = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.perf_counter()
+        if self._next is not None and now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+
+class VideoFileSource:
+    """
+    Replay a recorded video.
+
+    :param fps: Delivery rate; None plays as fast as possible, "native" at the recorded rate.
+    :param loop: Start over at the end instead of reporting end of stream.
+    """
+
+    def __init__(self, path, fps=None, loop=False):
+        self.path = path
+        self.loop = loop
+        self._cap = cv2.VideoCapture(path)
+        if fps == "native":
+            fps = self._cap.get(cv2.CAP_PROP_FPS) or None
+        self._pacer = Pacer(fps)
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def read(self):
+        self._pacer.wait()
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        return ret, frame
+
+    def release(self):
+        self._cap.release()
+
+
+class ImageDirectorySource:
+    """
+    Replay a directory of still images in file-name order.
+
+    :param fps: Delivery rate; None plays as fast as the images decode.
+    :param loop: Start over at the end instead of reporting end of stream.
+    """
+
+    def __init__(self, path, fps=None, loop=False):
+        self.paths = sorted(os.path.join(path, name) for name in os.listdir(path)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self.loop = loop
+        self._index = 0
+        self._pacer = Pacer(None if fps == "native" else fps)
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def read(self):
+        self._pacer.wait()
+        if self._index >= len(self.paths):
+            if not self.loop or not self.paths:
+                return False, None
+            self._index = 0
+        frame = cv2.imread(self.paths[self._index])
+        self._index += 1
+        return frame is not None, frame
+
+    def release(self):
+        self._index = len(self.paths)
+
+
+def parse_rate(text):
+    """Command-line replay rate: "native", "max" (None) or frames per second."""
+    if text in ("native", "max"):
+        return None if text == "max" else text
+    return float(text)
+
+
+def open_capture(spec, fps="native", loop=False):
+    """
+    Open a camera index ("0"), a video file or an image directory.
+    :param fps: Replay rate for recordings: "native", a number, or None for maximum rate. Cameras ignore it.
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps, loop)
+    return VideoFileSource(spec, fps, loop)
+
+
+class WindowSink:
+    """cv2.imshow / cv2.waitKey."""
+
+    def show(self, name, frame):
+        cv2.imshow(name, frame)
+
+    def poll_key(self, delay=1):
+        """Key pressed during the last delay milliseconds as a character code, or -1."""
+        key = cv2.waitKey(delay)
+        return key & 0xFF if key != -1 else -1
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class HeadlessSink:
+    """
+    Accepts frames without a display.
+
+    :param record: Optional video path the shown frames are written to.
+    :param fps: Frame rate stored in the recording.
+    """
+
+    def __init__(self, record=None, fps=15):
+        self.record = record
+        self.fps = fps
+        self.frames = 0
+        self._writer = None
+
+    def show(self, name, frame):
+        self.frames += 1
+        if self.record is None:
+            return
+        if self._writer is None:
+            height, width = frame.shape[:2]
+            self._writer = cv2.VideoWriter(self.record, cv2.VideoWriter_fourcc(*"mp4v"), self.fps, (width, height))
+        self._writer.write(frame)
+
+    def poll_key(self, delay=1):
+        return -1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+
+
+def open_sink(headless=False, record=None):
+    return HeadlessSink(record) if headless else WindowSink()
+
+
+def record_clip(path, source="0", seconds=10.0, fps=15):
+    """Record a reference clip from a camera for later replay and benchmarking."""
+    cap = open_capture(source)
+    if not cap.isOpened():
+        print(f"Error: Could not open video source {source}.")
+        return 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    sink = HeadlessSink(record=path, fps=fps)
+    pacer = Pacer(fps)
+    end = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < end:
+            pacer.wait()
+            ret, frame = cap.read()
+            if not ret:
+                break
+            sink.show("record", frame)
+    finally:
+        cap.release()
+        sink.close()
+    print(f"Recorded {sink.frames} frames to {path}")
+    return sink.frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["record"])
+    parser.add_argument("path", help="output video file")
+    parser.add_argument("--source", default="0")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--fps", type=int, default=15)
+    args = parser.parse_args()
+    record_clip(args.path, args.source, args.seconds, args.fps)
+
+
+if __name__ == "__main__":
+    main()
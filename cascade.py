@@ -0,0 +1,105 @@
+"""
+Region-of-interest cascade: cheap person evidence gates the heavy face model.
+
+The compositor publishes what it last saw (tracked person boxes and pose
+landmarks). Pose only runs while a person is present, and FaceMesh only
+runs on a small square crop around the face found by pose (or the head of
+a person box), downscaled before inference. Landmarks are mapped back to
+full-frame normalized coordinates afterwards, so consumers are unchanged.
+"""
+import threading
+
+import cv2
+import numpy as np
+
+# Pose landmarks 0-10 cover the nose, eyes, ears and mouth
+POSE_FACE_LANDMARKS = slice(0, 11)
+
+
+def face_roi_from_pose(points, width, height, scale=2.2, min_visibility=0.5):
+    """Square pixel ROI (x0, y0, x1, y1) around the visible pose face landmarks, or None."""
+    face = points[POSE_FACE_LANDMARKS]
+    face = face[face[:, 3] > min_visibility]
+    if len(face) < 3:
+        return None
+    xs, ys = face[:, 0] * width, face[:, 1] * height
+    center_x, center_y = (xs.min() + xs.max()) / 2, (ys.min() + ys.max()) / 2
+    side = scale * max(xs.max() - xs.min(), ys.max() - ys.min(), 1.0)
+    return clip_roi(center_x, center_y, side, width, height)
+
+
+def face_roi_from_box(box, width, height):
+    """Square pixel ROI over the head of an x, y, w, h person box."""
+    x, y, w, h = box
+    side = min(w, h * 0.4)
+    return clip_roi(x + w / 2, y + side / 2, side, width, height)
+
+
+def clip_roi(center_x, center_y, side, width, height):
+    x0, y0 = int(max(center_x - side / 2, 0)), int(max(center_y - side / 2, 0))
+    x1, y1 = int(min(center_x + side / 2, width)), int(min(center_y + side / 2, height))
+    if x1 - x0 < 16 or y1 - y0 < 16:
+        return None
+    return x0, y0, x1, y1
+
+
+def to_frame_coords(points, roi, width, height):
+    """Map landmarks normalized to an ROI crop back to full-frame normalized coordinates, in place."""
+    x0, y0, x1, y1 = roi
+    points[:, 0] = (x0 + points[:, 0] * (x1 - x0)) / width
+    points[:, 1] = (y0 + points[:, 1] * (y1 - y0)) / height
+    points[:, 2] *= (x1 - x0) / width
+    return points
+
+
+class FaceCascade:
+    """
+    Person evidence shared between the compositor and the model stages.
+
+    :param person_class_id: YOLO class ID that counts as a person.
+    :param max_side: Face crops larger than this are downscaled before FaceMesh.
+    """
+
+    def __init__(self, person_class_id=0, max_side=192):
+        self.person_class_id = person_class_id
+        self.max_side = max_side
+        self._lock = threading.Lock()
+        self._person_present = False
+        self._roi = None
+
+    def publish(self, frame_shape, class_ids, boxes, pose_points=None):
+        """Record the latest tracked boxes and pose landmarks (pose_points may be None)."""
+        height, width = frame_shape[:2]
+        people = np.asarray(boxes)[np.asarray(class_ids) == self.person_class_id]
+        roi = face_roi_from_pose(pose_points, width, height) if pose_points is not None else None
+        if roi is None and len(people):
+            largest = people[np.argmax(people[:, 2] * people[:, 3])]
+            roi = face_roi_from_box(largest, width, height)
+        with self._lock:
+            self._person_present = len(people) > 0 or pose_points is not None
+            self._roi = roi
+
+    def person_present(self):
+        with self._lock:
+            return self._person_present
+
+    def face_roi(self):
+        with self._lock:
+            return self._roi
+
+    def crop(self, rgb):
+        """
+        Cut and downscale the current face ROI from an RGB frame.
+        :return: Tuple (crop, roi), or (None, None) when there is no face to look at.
+        """
+        roi = self.face_roi()
+        if roi is None:
+            return None, None
+        x0, y0, x1, y1 = roi
+        crop = rgb[y0:y1, x0:x1]
+        side = max(x1 - x0, y1 - y0)
+        if side > self.max_side:
+            factor = self.max_side / side
+            crop = cv2.resize(crop, (max(int((x1 - x0) * factor), 1), max(int((y1 - y0) * factor), 1)),
+                              interpolation=cv2.INTER_AREA)
+        return np.ascontiguousarray(crop), roi
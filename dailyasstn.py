@@ -1,22 +1,31 @@
-import time
 from datetime import datetime
-import pyttsx3
+import speech
 import weather
+from reminder_store import ReminderStore
+from reminders import ReminderScheduler
 
 def assistant():
-    # Initialize the text-to-speech engine
-    engine = pyttsx3.init()
+    # Start the shared text-to-speech service
+    speech.get_service()
 
     def speak(message):
         """
         Speaks the given message using text-to-speech.
         :param message: String message to be spoken.
         """
-        engine.say(message)
-        engine.runAndWait()
+        speech.say(message, wait=True)
 
-    # List of reminders with task description and time in minutes
-    reminders = []
+    def announce(reminder):
+        """
+        Speaks a reminder when it is due; runs on the scheduler thread.
+        :param reminder: The Reminder that fired.
+        """
+        message = f"Reminder: {reminder.task}"
+        print(message)
+        speech.say(message, priority=speech.URGENT, wait=True)
+
+    # Reminders are kept in reminders.db; the scheduler thread sleeps until the next one is due
+    scheduler = ReminderScheduler(announce, store=ReminderStore())
 
     def time_to_minutes(period, time_input):
         """
@@ -79,8 +88,8 @@ def assistant():
                     print(f"You said: {task_input}")
 
                     # Add the reminder
-                    reminders.append({"time": time_in_minutes, "task": task_input})
-                    print(f"Reminder added: {task_input} at {time_in_minutes} minutes from midnight")
+                    reminder = scheduler.at(task_input, time_in_minutes // 60, time_in_minutes % 60)
+                    print(f"Reminder added: {task_input} at {reminder.time_text()}")
                     speak(f"Reminder added for {task_input} at {time_input} {period.upper()}")
 
                     more = input("Do you want to add another reminder? (yes/no): ").strip().lower()
@@ -93,38 +102,16 @@ def assistant():
                 print(e)
                 speak(str(e))
 
-    def check_reminders():
-        """
-        Continuously checks the current time and triggers reminders.
-        """
-        print("Daily Task Reminder system is running...")
-        notified_tasks = set()  # To avoid multiple notifications for the same task
-
-        while True:
-            # Get the current time in minutes from midnight
-            now = datetime.now()
-            current_minutes = now.hour * 60 + now.minute
-
-            for reminder in reminders:
-                if current_minutes == reminder["time"] and reminder["time"] not in notified_tasks:
-                    # Notify the user
-                    message = "Reminder: {reminder['task']}"
-                    print(message)
-                    speak(message)
-
-                    # Add the task to the notified set
-                    notified_tasks.add(reminder["time"])
-
-            time.sleep(30)  # Check every 30 seconds
-
     # Interactive menu for setting reminders
     print("Welcome to your Personal Assistant Reminder System!")
+    scheduler.start()
     add_reminder()
-
-    # Run the reminder system
-    check_reminders()
+    print("Daily Task Reminder system is running...")
 
     speak("I will also tell you the weather outside")
     weather.main()
 
-    
+    # Keep running until every reminder has been announced
+    scheduler.wait_idle()
+    scheduler.stop()
+    scheduler.store.close()
@@ -0,0 +1,175 @@
+import threading
+
+import cv2
+import numpy as np
+
+import metrics
+
+from dnn_backend import select_backend
+
+
+def load_classes(path="coco.names"):
+    """Read one class label per line."""
+    with open(path, "r") as f:
+        return [line.strip() for line in f.readlines()]
+
+
+def class_ids_for(classes, names):
+    """Map label names (e.g. ["person"]) to their indices in classes."""
+    return [classes.index(name) for name in names]
+
+
+def decode_outputs(outputs, width, height, conf_threshold=0.5, nms_threshold=0.4,
+                   allowed_classes=None, per_class_nms=False):
+    """
+    Turn raw YOLO output heads into NMS-filtered detections in one pass.
+
+    All heads are concatenated once; class IDs, confidences and pixel boxes are
+    computed with whole-array operations and only rows above the threshold
+    (and in the allow-list, if given) reach the box maths.
+
+    :param outputs: Sequence of (rows, 5 + num_classes) arrays from net.forward.
+    :param width: Frame width in pixels.
+    :param height: Frame height in pixels.
+    :param conf_threshold: Minimum class score to keep a row.
+    :param nms_threshold: IoU threshold for non-maximum suppression.
+    :param allowed_classes: Optional iterable of class IDs to keep.
+    :param per_class_nms: Suppress overlaps only between boxes of the same class.
+    :return: Tuple (boxes, confidences, class_ids) of the kept detections, boxes as int x, y, w, h rows.
+    """
+    predictions = outputs[0] if len(outputs) == 1 else np.concatenate(outputs, axis=0)
+    scores = predictions[:, 5:]
+    class_ids = np.argmax(scores, axis=1)
+    confidences = np.take_along_axis(scores, class_ids[:, None], axis=1)[:, 0]
+
+    mask = confidences > conf_threshold
+    if allowed_classes is not None:
+        mask &= np.isin(class_ids, np.asarray(list(allowed_classes)))
+    if not mask.any():
+        return np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int64)
+
+    class_ids = class_ids[mask]
+    confidences = confidences[mask].astype(np.float32)
+    centers = (predictions[mask, :4] * np.array([width, height, width, height], dtype=np.float32)).astype(np.int32)
+    boxes = centers.copy()
+    boxes[:, 0] = (centers[:, 0] - centers[:, 2] / 2).astype(np.int32)
+    boxes[:, 1] = (centers[:, 1] - centers[:, 3] / 2).astype(np.int32)
+
+    if per_class_nms:
+        indexes = _batched_nms(boxes, confidences, class_ids, conf_threshold, nms_threshold)
+    else:
+        indexes = cv2.dnn.NMSBoxes(boxes, confidences, conf_threshold, nms_threshold)
+    indexes = np.asarray(indexes, dtype=np.int64).reshape(-1)
+    return boxes[indexes], confidences[indexes], class_ids[indexes]
+
+
+def _batched_nms(boxes, confidences, class_ids, conf_threshold, nms_threshold):
+    if hasattr(cv2.dnn, "NMSBoxesBatched"):
+        return cv2.dnn.NMSBoxesBatched(boxes, confidences, class_ids.astype(np.int32),
+                                       conf_threshold, nms_threshold)
+    # Older OpenCV: shift each class into its own region so boxes of
+    # different classes can never overlap
+    offset = int(boxes[:, :2].max() - boxes[:, :2].min() + boxes[:, 2:].max()) + 1
+    shifted = boxes.copy()
+    shifted[:, :2] += (class_ids * offset)[:, None].astype(np.int32)
+    return cv2.dnn.NMSBoxes(shifted, confidences, conf_threshold, nms_threshold)
+
+
+class Detector:
+    """
+    YOLO detector around the cv2.dnn net with per-frame allocations removed.
+
+    Output layer names are resolved once and every frame is resized, colour
+    swapped and scaled into the same preallocated input blob.
+
+    :param input_size: Network input resolution, a multiple of 32 such as
+        320 (fastest), 416 (default) or 608 (most accurate).
+    :param backend: cv2.dnn backend ID, or "auto" to probe for the fastest one.
+    :param target: cv2.dnn target ID; ignored when backend is "auto".
+    """
+
+    INPUT_SIZES = (320, 416, 608)
+
+    def __init__(self, weights="yolov4-tiny.weights", cfg="yolov4-tiny.cfg", names="coco.names",
+                 input_size=416, backend="auto", target=cv2.dnn.DNN_TARGET_CPU):
+        if input_size % 32:
+            raise ValueError(f"YOLO input size must be a multiple of 32, got {input_size}.")
+        self.input_size = input_size
+        self.classes = load_classes(names)
+        if backend == "auto":
+            backend, target = select_backend(weights, cfg, input_size)
+        self.net = cv2.dnn.readNet(weights, cfg)
+        self.net.setPreferableBackend(backend)
+        self.net.setPreferableTarget(target)
+        self.output_names = list(self.net.getUnconnectedOutLayersNames())
+
+        self._resized = np.empty((input_size, input_size, 3), dtype=np.uint8)
+        self._rgb = np.empty_like(self._resized)
+        self._blob = np.empty((1, 3, input_size, input_size), dtype=np.float32)
+        self._batch_blob = self._blob
+        # The network and the reused buffers may be shared by several sessions' threads
+        self._lock = threading.Lock()
+
+    def blob_from_image(self, frame, blob=None, index=0):
+        """Equivalent of blobFromImage(frame, 1/255, size, swapRB=True) into the reused buffer."""
+        size = self.input_size
+        blob = self._blob if blob is None else blob
+        cv2.resize(frame, (size, size), dst=self._resized)
+        cv2.cvtColor(self._resized, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        np.multiply(self._rgb.transpose(2, 0, 1), 0.00392, out=blob[index], dtype=np.float32)
+        return blob
+
+    def blob_from_images(self, frames):
+        """Equivalent of blobFromImages for a batch, reusing a buffer sized to the largest batch seen."""
+        if len(self._batch_blob) < len(frames):
+            self._batch_blob = np.empty((len(frames), 3, self.input_size, self.input_size), dtype=np.float32)
+        blob = self._batch_blob[:len(frames)]
+        for index, frame in enumerate(frames):
+            self.blob_from_image(frame, blob, index)
+        return blob
+
+    def forward(self, frame):
+        """Run the network on a BGR frame and return the raw output heads."""
+        with self._lock:
+            self.net.setInput(self.blob_from_image(frame))
+            return self.net.forward(self.output_names)
+
+    def detect(self, frame, conf_threshold=0.5, nms_threshold=0.4, allowed_classes=None, per_class_nms=False):
+        """Run the network and decode its outputs; see decode_outputs for the return value."""
+        height, width = frame.shape[:2]
+        with metrics.timer("yolo_forward"):
+            outputs = self.forward(frame)
+        with metrics.timer("yolo_decode"):
+            return decode_outputs(outputs, width, height, conf_threshold, nms_threshold,
+                                  allowed_classes=allowed_classes, per_class_nms=per_class_nms)
+
+    def detect_batch(self, frames, conf_threshold=0.5, nms_threshold=0.4, allowed_classes=None,
+                     per_class_nms=False):
+        """
+        Detect objects in several frames with a single forward pass.
+        :return: One (boxes, confidences, class_ids) tuple per frame, in input order.
+        """
+        with metrics.timer("yolo_forward"), self._lock:
+            self.net.setInput(self.blob_from_images(frames))
+            outputs = self.net.forward(self.output_names)
+        # Region layers return either (batch, rows, values) or (batch * rows, values)
+        outputs = [output.reshape(len(frames), -1, output.shape[-1]) for output in outputs]
+        results = []
+        with metrics.timer("yolo_decode"):
+            for index, frame in enumerate(frames):
+                height, width = frame.shape[:2]
+                results.append(decode_outputs([output[index] for output in outputs], width, height,
+                                              conf_threshold, nms_threshold, allowed_classes=allowed_classes,
+                                              per_class_nms=per_class_nms))
+        return results
+
+
+def direction_of(center_x, width):
+    """Coarse horizontal position used in spoken feedback."""
+    return "left" if center_x < width // 3 else "right" if center_x > 2 * width // 3 else "center"
+
+
+def describe(classes, boxes, class_ids, width):
+    """Spoken summary such as "person on your left, chair on your center"."""
+    return ", ".join(f"{classes[class_id]} on your {direction_of(x + w // 2, width)}"
+                     for (x, y, w, h), class_id in zip(boxes.tolist(), class_ids))
@@ -0,0 +1,110 @@
+import json
+import os
+import platform
+import time
+
+import cv2
+import numpy as np
+
+CACHE_PATH = ".dnn_backend.json"
+
+# (name, backend, target) in the order they are tried
+CANDIDATES = [
+    ("opencv-cpu", cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU),
+    ("openvino-cpu", cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE, cv2.dnn.DNN_TARGET_CPU),
+    ("cuda", cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA),
+    ("cuda-fp16", cv2.dnn.DNN_BACKEND_CUDA, cv2.dnn.DNN_TARGET_CUDA_FP16),
+]
+
+
+def available_candidates():
+    """Backend/target pairs this OpenCV build reports as usable."""
+    available = []
+    for name, backend, target in CANDIDATES:
+        if backend == cv2.dnn.DNN_BACKEND_CUDA:
+            try:
+                if cv2.cuda.getCudaEnabledDeviceCount() == 0:
+                    continue
+            except (AttributeError, cv2.error):
+                continue
+        try:
+            if target not in cv2.dnn.getAvailableTargets(backend):
+                continue
+        except cv2.error:
+            continue
+        available.append((name, backend, target))
+    return available
+
+
+def measure(weights, cfg, backend, target, input_size=416, warmup=2, runs=5):
+    """
+    Time inference on one backend/target pair.
+    :return: Mean milliseconds per forward pass after warm-up.
+    """
+    net = cv2.dnn.readNet(weights, cfg)
+    net.setPreferableBackend(backend)
+    net.setPreferableTarget(target)
+    output_names = net.getUnconnectedOutLayersNames()
+    blob = np.random.default_rng(0).random((1, 3, input_size, input_size), dtype=np.float32)
+    net.setInput(blob)
+    for _ in range(warmup):
+        net.forward(output_names)
+    start = time.perf_counter()
+    for _ in range(runs):
+        net.setInput(blob)
+        net.forward(output_names)
+    return 1000 * (time.perf_counter() - start) / runs
+
+
+def _cache_key(weights, cfg, input_size):
+    return "|".join([platform.node(), cv2.__version__, os.path.abspath(cfg),
+                     str(os.path.getmtime(weights)), str(input_size)])
+
+
+def _load_cache(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def select_backend(weights="yolov4-tiny.weights", cfg="yolov4-tiny.cfg", input_size=416,
+                   cache_path=CACHE_PATH, refresh=False):
+    """
+    Pick the fastest available backend and target for the net.
+
+    Every available candidate gets a short warm-up and timed run; the result
+    is cached on disk per host, OpenCV version, model and input size so the
+    probe only runs again when one of those changes.
+
+    :return: Tuple (backend, target) for setPreferableBackend/setPreferableTarget.
+    """
+    key = _cache_key(weights, cfg, input_size)
+    cache = _load_cache(cache_path) if cache_path else {}
+    if not refresh and key in cache:
+        choice = cache[key]
+        print(f"DNN backend: {choice['name']} ({choice['ms']:.1f} ms/frame, cached)")
+        return choice["backend"], choice["target"]
+
+    results = []
+    for name, backend, target in available_candidates():
+        try:
+            ms = measure(weights, cfg, backend, target, input_size)
+        except cv2.error as e:
+            print(f"DNN backend {name} failed: {e}")
+            continue
+        print(f"DNN backend {name}: {ms:.1f} ms/frame")
+        results.append((ms, name, backend, target))
+
+    if not results:
+        print("DNN backend: no candidate ran, using the OpenCV CPU default")
+        return cv2.dnn.DNN_BACKEND_OPENCV, cv2.dnn.DNN_TARGET_CPU
+
+    ms, name, backend, target = min(results)
+    print(f"DNN backend: {name} ({ms:.1f} ms/frame)")
+    if cache_path:
+        cache[key] = {"name": name, "backend": backend, "target": target, "ms": ms}
+        with open(cache_path, "w") as f:
+            json.dump(cache, f, indent=2)
+    return backend, target
@@ -0,0 +1,168 @@
+"""
+Compact on-disk facial expression classifier.
+
+The build step turns facial_expression_data_new.csv into float32 arrays
+(optionally PCA-reduced) with precomputed squared norms, so startup is a
+memory-map instead of a CSV parse and KNN fit, and a prediction is a single
+matrix-vector product:
+
+    python expression_model.py build --components 64
+    python expression_model.py bench
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+DATASET_PATH = "facial_expression_data_new.csv"
+MODEL_DIR = "expression_model"
+
+
+def build(csv_path=DATASET_PATH, model_dir=MODEL_DIR, components=None):
+    """Write the model arrays for csv_path into model_dir."""
+    import pandas as pd
+
+    data = pd.read_csv(csv_path)
+    features = data.iloc[:, :-1].values.astype(np.float32)
+    labels, codes = np.unique(data.iloc[:, -1].values, return_inverse=True)
+
+    mean = np.zeros(features.shape[1], dtype=np.float32)
+    projection = None
+    if components:
+        mean = features.mean(axis=0)
+        _, _, vt = np.linalg.svd(features - mean, full_matrices=False)
+        projection = np.ascontiguousarray(vt[:components].T, dtype=np.float32)
+        features = (features - mean) @ projection
+
+    os.makedirs(model_dir, exist_ok=True)
+    np.save(os.path.join(model_dir, "features.npy"), np.ascontiguousarray(features, dtype=np.float32))
+    np.save(os.path.join(model_dir, "norms.npy"), np.einsum("ij,ij->i", features, features).astype(np.float32))
+    np.save(os.path.join(model_dir, "codes.npy"), codes.astype(np.int32))
+    np.save(os.path.join(model_dir, "mean.npy"), mean)
+    projection_path = os.path.join(model_dir, "projection.npy")
+    if projection is not None:
+        np.save(projection_path, projection)
+    elif os.path.exists(projection_path):
+        # A projection left by an earlier PCA build would be applied to the new, unreduced features
+        os.remove(projection_path)
+    with open(os.path.join(model_dir, "meta.json"), "w") as f:
+        json.dump({"labels": [str(label) for label in labels], "source": os.path.abspath(csv_path),
+                   "source_mtime": os.path.getmtime(csv_path), "components": components,
+                   "dimensions": int(data.shape[1] - 1)}, f, indent=2)
+
+
+class ExpressionModel:
+    """
+    Brute-force k-nearest-neighbour classifier over memory-mapped arrays.
+
+    Matches KNeighborsClassifier(n_neighbors=3) with uniform weights on the
+    same features; with PCA the distances are taken in the reduced space.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, n_neighbors=3, mmap=True):
+        mode = "r" if mmap else None
+        with open(os.path.join(model_dir, "meta.json"), "r") as f:
+            self.meta = json.load(f)
+        self.labels = np.array(self.meta["labels"])
+        self.n_neighbors = n_neighbors
+        self.features = np.load(os.path.join(model_dir, "features.npy"), mmap_mode=mode)
+        self.norms = np.load(os.path.join(model_dir, "norms.npy"), mmap_mode=mode)
+        self.codes = np.load(os.path.join(model_dir, "codes.npy"), mmap_mode=mode)
+        self.mean = np.load(os.path.join(model_dir, "mean.npy"))
+        projection_path = os.path.join(model_dir, "projection.npy")
+        self.projection = np.load(projection_path) if os.path.exists(projection_path) else None
+
+    def transform(self, features):
+        features = np.asarray(features, dtype=np.float32)
+        if self.projection is not None:
+            features = (features - self.mean) @ self.projection
+        return features
+
+    def predict(self, features):
+        """
+        Classify one feature vector or a batch of them.
+        :param features: Array of shape (dimensions,) or (n, dimensions).
+        :return: A label, or an array of labels for a batch.
+        """
+        single = np.ndim(features) == 1
+        queries = self.transform(np.atleast_2d(features))
+        # |x - q|^2 up to the per-query constant |q|^2
+        distances = self.norms[None, :] - 2 * queries @ self.features.T
+        k = min(self.n_neighbors, distances.shape[1])
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        votes = np.apply_along_axis(np.bincount, 1, self.codes[nearest], minlength=len(self.labels))
+        predictions = self.labels[votes.argmax(axis=1)]
+        return predictions[0] if single else predictions
+
+
+def load_or_build(csv_path=DATASET_PATH, model_dir=MODEL_DIR, components=None, **kwargs):
+    """
+    Load the model, rebuilding it first if it is missing or older than the CSV.
+    Without the CSV the built model is loaded as it is.
+    :param components: PCA dimensions to require; None accepts whatever was built and keeps it on a rebuild.
+    """
+    meta_path = os.path.join(model_dir, "meta.json")
+    stale = not os.path.exists(meta_path)
+    if not stale:
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if components is None:
+            components = meta["components"]
+        stale = meta["components"] != components
+        if os.path.exists(csv_path):
+            stale = stale or meta["source_mtime"] < os.path.getmtime(csv_path)
+    if stale:
+        build(csv_path, model_dir, components)
+    return ExpressionModel(model_dir, **kwargs)
+
+
+def bench(csv_path=DATASET_PATH, model_dir=MODEL_DIR, repeat=200):
+    import pandas as pd
+    from sklearn.neighbors import KNeighborsClassifier
+
+    start = time.perf_counter()
+    data = pd.read_csv(csv_path)
+    knn = KNeighborsClassifier(n_neighbors=3)
+    knn.fit(data.iloc[:, :-1].values, data.iloc[:, -1].values)
+    fit_ms = 1000 * (time.perf_counter() - start)
+
+    # Build first if needed, so only the start-up path the apps take is timed
+    load_or_build(csv_path, model_dir)
+    start = time.perf_counter()
+    model = load_or_build(csv_path, model_dir)
+    load_ms = 1000 * (time.perf_counter() - start)
+
+    sample = data.iloc[0, :-1].values.astype(np.float32)
+    sample_list = sample.tolist()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        knn.predict([sample_list])
+    knn_ms = 1000 * (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        model.predict(sample)
+    model_ms = 1000 * (time.perf_counter() - start) / repeat
+
+    print(f"startup: CSV + KNN fit {fit_ms:.1f} ms, memory-mapped model {load_ms:.1f} ms")
+    print(f"predict: sklearn {knn_ms:.3f} ms, compact model {model_ms:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["build", "bench"])
+    parser.add_argument("--csv", default=DATASET_PATH)
+    parser.add_argument("--model-dir", default=MODEL_DIR)
+    parser.add_argument("--components", type=int, default=None, help="PCA dimensions to keep")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.csv, args.model_dir, args.components)
+        print(f"Wrote {args.model_dir}")
+    else:
+        bench(args.csv, args.model_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+
+class ModelSchedule:
+    """Cost estimate and trigger settings for one model."""
+
+    def __init__(self, name, priority, max_interval, on_motion):
+        self.name = name
+        self.priority = priority
+        self.max_interval = max_interval
+        self.on_motion = on_motion
+        self.cost = 0.0
+        self.last_run = None
+        self.last_elapsed = 0.0
+
+    def record(self, elapsed, smoothing=0.2):
+        self.last_elapsed = elapsed
+        self.cost = elapsed if self.cost == 0.0 else (1 - smoothing) * self.cost + smoothing * elapsed
+
+
+class DetectionScheduler:
+    """
+    Decides per frame which models to run.
+
+    Cheap models run every frame while they fit the frame-time budget.
+    Expensive, motion-triggered models (the object detector) run when the
+    scene changes, when the tracker loses confidence, or when their result
+    is older than max_interval; otherwise their last result is reused.
+
+    A model that is due (never run, older than its max_interval, or
+    triggered by motion or tracker loss) always runs, even over budget;
+    the other models then fill what budget is left, in priority order. A
+    model skipped for the budget becomes due after max_skip seconds, so
+    none is starved and every model's cost keeps being re-measured.
+
+    :param frame_budget: Target seconds of model time per frame.
+    :param motion_threshold: Mean absolute frame difference (0-1) that counts as a scene change.
+    :param concurrent: Models run in parallel, so the budget bounds the slowest one instead of the sum.
+    :param max_skip: Longest time in seconds a model without max_interval is skipped for the budget.
+    :param clock: Time source, injectable for tests.
+    """
+
+    def __init__(self, frame_budget=1 / 15, motion_threshold=0.02, concurrent=False, max_skip=1.0,
+                 clock=time.perf_counter):
+        self.frame_budget = frame_budget
+        self.motion_threshold = motion_threshold
+        self.max_skip = max_skip
+        self.concurrent = concurrent
+        self.clock = clock
+        self.models = {}
+        self.last_motion = 0.0
+        self._previous = None
+        self._small = None
+
+    def add_model(self, name, priority=0, max_interval=None, on_motion=False):
+        """
+        Register a model.
+        :param priority: Lower runs first when the budget is tight.
+        :param max_interval: Seconds after which the model runs regardless of motion.
+        :param on_motion: Only run on scene change, tracker loss or staleness.
+        """
+        self.models[name] = ModelSchedule(name, priority, max_interval, on_motion)
+        return self
+
+    def motion_energy(self, frame):
+        """Mean absolute difference against the previous frame on a 64x48 grey thumbnail."""
+        if self._small is None:
+            self._small = np.empty((48, 64), dtype=np.uint8)
+        gray = cv2.cvtColor(cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        if self._previous is None:
+            self._previous = gray
+            return 1.0
+        cv2.absdiff(gray, self._previous, dst=self._small)
+        self._previous = gray
+        return float(self._small.mean()) / 255
+
+    def plan(self, frame, tracker_confident=None):
+        """
+        Choose the models to run on this frame.
+        :param tracker_confident: True/False from an object tracker, or None when there is none.
+        :return: Set of model names.
+        """
+        now = self.clock()
+        self.last_motion = self.motion_energy(frame)
+        scene_changed = self.last_motion > self.motion_threshold
+
+        due, optional = [], []
+        for model in sorted(self.models.values(), key=lambda m: m.priority):
+            interval = model.max_interval if model.max_interval is not None else self.max_skip
+            stale = model.last_run is None or now - model.last_run >= interval
+            if model.on_motion:
+                # Motion and tracker loss are triggers, not requests: they override the budget
+                if stale or scene_changed or tracker_confident is False:
+                    due.append(model)
+            elif stale:
+                due.append(model)
+            else:
+                optional.append(model)
+
+        chosen, spent = set(), 0.0
+        for model in due:
+            chosen.add(model.name)
+            spent = max(spent, model.cost) if self.concurrent else spent + model.cost
+        # Cheaper models are deferred for this frame rather than the triggered ones
+        for model in optional:
+            cost = max(spent, model.cost) if self.concurrent else spent + model.cost
+            if cost > self.frame_budget and chosen:
+                continue
+            chosen.add(model.name)
+            spent = cost
+        return chosen
+
+    def record(self, name, elapsed):
+        """Report how long a planned model took so later plans can budget for it."""
+        model = self.models[name]
+        model.record(elapsed)
+        model.last_run = self.clock()
+
+    @contextmanager
+    def timed(self, name):
+        """Time a planned model run and record it."""
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start)
+
+
+def schedule_stages(scheduler, prepare, stages, tracker_confident=None):
+    """
+    Wrap FramePipeline stages so each runs only when the scheduler plans it.
+
+    A skipped stage returns its previous result so the compositor still has
+    something to draw; the names of the stages that actually ran are left in
+    packet.views["ran"].
+    :param tracker_confident: Optional callable returning the tracker state for the next plan.
+    """
+    last = {}
+
+    def scheduled_prepare(packet):
+        if prepare is not None:
+            prepare(packet)
+        confident = tracker_confident() if tracker_confident is not None else None
+        packet.views["plan"] = scheduler.plan(packet.image, confident)
+        packet.views["ran"] = set()
+
+    def wrap(name, stage):
+        def run(packet):
+            if name in packet.views["plan"] or name not in last:
+                with scheduler.timed(name):
+                    last[name] = stage(packet)
+                packet.views["ran"].add(name)
+            return last[name]
+        return run
+
+    return scheduled_prepare, {name: wrap(name, stage) for name, stage in stages.items()}
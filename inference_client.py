@@ -0,0 +1,52 @@
+"""
+Thin client for inference_server.py.
+
+Lets the Tkinter assistant, the Streamlit apps and command-line scripts use
+the models loaded once by the server instead of loading their own.
+
+    client = InferenceClient()
+    result = client.infer(frame)      # {"detections": [...], "action": ..., "expressions": [...], ...}
+"""
+import cv2
+import requests
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+class InferenceClient:
+    """
+    :param url: Base URL of the inference server.
+    :param jpeg_quality: JPEG quality used to send frames; None sends raw BGR bytes.
+    """
+
+    def __init__(self, url=DEFAULT_URL, jpeg_quality=85, timeout=10.0):
+        self.url = url.rstrip("/")
+        self.jpeg_quality = jpeg_quality
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def infer(self, frame, models=None):
+        """
+        Analyze one BGR frame.
+        :param models: Iterable of "yolo", "pose", "face"; all of them by default.
+        :return: The server's JSON result as a dict.
+        """
+        params = {"models": ",".join(models)} if models else {}
+        if self.jpeg_quality is None:
+            height, width = frame.shape[:2]
+            params.update(width=width, height=height)
+            body, content_type = frame.tobytes(), "application/octet-stream"
+        else:
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            if not ok:
+                raise ValueError("Could not encode frame.")
+            body, content_type = encoded.tobytes(), "image/jpeg"
+        response = self._session.post(f"{self.url}/infer", data=body, params=params,
+                                      headers={"Content-Type": content_type}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self):
+        response = self._session.get(f"{self.url}/stats", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,273 @@
+"""
+Local inference server shared by the UIs and scripts.
+
+Loads YOLO, MediaPipe Pose/FaceMesh, the expression model and the distance
+table once and answers frames sent over HTTP or WebSocket with JSON.
+Requests that arrive close together are micro-batched: their frames go
+through a single YOLO forward pass (Detector.detect_batch) before pose,
+face and distances are worked out per frame. Needs the optional aiohttp
+package.
+
+    python inference_server.py --port 8765
+
+HTTP:      POST /infer with a JPEG/PNG body (image/jpeg, image/png), or raw
+           BGR bytes (application/octet-stream) plus ?width=&height=.
+           ?models=yolo,pose,face limits the analyses (all by default).
+WebSocket: /ws; send JPEG/PNG frames as binary messages, or raw BGR frames
+           as b"BGR" + little-endian uint16 width, height + pixels. Each
+           frame gets one JSON text message back, in order.
+GET /stats reports request and batch counters.
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import models
+from landmarks import FACE_LANDMARKS, POSE_LANDMARKS, LandmarkArray, infer_action
+
+try:
+    from aiohttp import WSMsgType, web
+except ImportError:
+    web = None
+
+ALL_MODELS = frozenset(("yolo", "pose", "face"))
+RAW_MAGIC = b"BGR"
+
+
+def decode_frame(data, content_type=None, width=None, height=None):
+    """Turn an encoded image, or raw BGR bytes with a known size, into a BGR array."""
+    if content_type == "application/octet-stream" or (width and height):
+        if not (width and height):
+            raise ValueError("Raw frames need width and height.")
+        width, height = int(width), int(height)
+        if len(data) != width * height * 3:
+            raise ValueError(f"Expected {width * height * 3} raw BGR bytes, got {len(data)}.")
+        return np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+    frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Could not decode image.")
+    return frame
+
+
+def decode_ws_frame(data):
+    """WebSocket binary message: an encoded image, or RAW_MAGIC + width, height + BGR bytes."""
+    if data[:3] == RAW_MAGIC:
+        width, height = struct.unpack_from("<HH", data, 3)
+        return decode_frame(data[7:], width=width, height=height)
+    return decode_frame(data)
+
+
+def parse_models(text):
+    if not text:
+        return ALL_MODELS
+    wanted = frozenset(name.strip() for name in text.split(",") if name.strip())
+    unknown = wanted - ALL_MODELS
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(sorted(unknown))}.")
+    return wanted
+
+
+class Analyzer:
+    """
+    The per-frame work, run on one inference thread.
+
+    Frames reach the server from unrelated clients, so Pose and FaceMesh
+    run in static image mode rather than tracking from frame to frame.
+    """
+
+    def __init__(self, input_size=416):
+        self.detector = models.get("yolo", input_size)
+        self.classes = self.detector.classes
+        self.estimator = models.get("distance")
+        self.knn = models.get("expression")
+        self.pose = models.get("pose", True)
+        self.face_mesh = models.get("face_mesh", True)
+        self.pose_points = LandmarkArray(POSE_LANDMARKS)
+        self.face_points = LandmarkArray(FACE_LANDMARKS)
+
+    def analyze_batch(self, frames, wanted):
+        """
+        :param frames: BGR arrays.
+        :param wanted: One set of model names per frame.
+        :return: One JSON-ready dict per frame.
+        """
+        results = [{} for _ in frames]
+        yolo_indices = [i for i, names in enumerate(wanted) if "yolo" in names]
+        if yolo_indices:
+            detections = self.detector.detect_batch([frames[i] for i in yolo_indices])
+            for i, (boxes, confidences, class_ids) in zip(yolo_indices, detections):
+                results[i].update(self.describe_detections(frames[i], boxes, confidences, class_ids))
+        for frame, names, result in zip(frames, wanted, results):
+            if "pose" in names or "face" in names:
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                if "pose" in names:
+                    result["action"] = self.action(rgb)
+                if "face" in names:
+                    result["expressions"] = self.expressions(rgb)
+        return results
+
+    def describe_detections(self, frame, boxes, confidences, class_ids):
+        width = frame.shape[1]
+        distances = self.estimator.estimate(boxes, class_ids, width)
+        detections = [{"label": self.classes[class_id], "confidence": round(confidence, 3),
+                       "box": box, "distance_m": round(distance, 2) if np.isfinite(distance) else None}
+                      for box, confidence, class_id, distance in
+                      zip(boxes.tolist(), confidences.tolist(), class_ids.tolist(), distances.tolist())]
+        return {"detections": detections, "description": self.estimator.describe(boxes, class_ids, width)}
+
+    def action(self, rgb):
+        pose_results = self.pose.process(rgb)
+        if not pose_results.pose_landmarks:
+            return None
+        return infer_action(self.pose_points.fill(pose_results.pose_landmarks))
+
+    def expressions(self, rgb):
+        face_results = self.face_mesh.process(rgb)
+        expressions = []
+        for face_landmarks in face_results.multi_face_landmarks or []:
+            self.face_points.fill(face_landmarks)
+            expressions.append(str(self.knn.predict(self.face_points.xy_features("planar"))))
+        return expressions
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into batches for the analyzer.
+
+    The first waiting frame opens a batch; it is closed after max_wait
+    seconds or once max_batch frames are in, then run on the single
+    inference thread while the next batch collects.
+    """
+
+    def __init__(self, analyzer, max_batch=8, max_wait=0.005):
+        self.analyzer = analyzer
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = 0
+        self.batches = 0
+        self.busy_time = 0.0
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="inference")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, frame, wanted=ALL_MODELS):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((frame, wanted, future))
+        return await future
+
+    def stats(self):
+        return {"requests": self.requests, "batches": self.batches,
+                "mean_batch": self.requests / self.batches if self.batches else 0.0,
+                "busy_s": round(self.busy_time, 3), "queued": self._queue.qsize()}
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            frames = [frame for frame, _, _ in batch]
+            wanted = [names for _, names, _ in batch]
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._executor, self.analyzer.analyze_batch, frames, wanted)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.busy_time += time.perf_counter() - start
+            self.requests += len(batch)
+            self.batches += 1
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+
+def make_app(batcher):
+    async def infer(request):
+        try:
+            frame = decode_frame(await request.read(), request.content_type,
+                                 request.query.get("width"), request.query.get("height"))
+            wanted = parse_models(request.query.get("models"))
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response(await batcher.submit(frame, wanted))
+
+    async def websocket(request):
+        ws = web.WebSocketResponse(max_msg_size=32 * 1024 * 1024)
+        await ws.prepare(request)
+        try:
+            wanted = parse_models(request.query.get("models"))
+        except ValueError as e:
+            await ws.send_json({"error": str(e)})
+            await ws.close()
+            return ws
+        async for message in ws:
+            if message.type != WSMsgType.BINARY:
+                continue
+            try:
+                result = await batcher.submit(decode_ws_frame(message.data), wanted)
+            except ValueError as e:
+                result = {"error": str(e)}
+            await ws.send_str(json.dumps(result))
+        return ws
+
+    async def stats(request):
+        return web.json_response(batcher.stats())
+
+    async def on_startup(app):
+        batcher.start()
+
+    async def on_cleanup(app):
+        await batcher.stop()
+
+    app = web.Application(client_max_size=32 * 1024 * 1024)
+    app.add_routes([web.post("/infer", infer), web.get("/ws", websocket), web.get("/stats", stats)])
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--input-size", type=int, default=416)
+    parser.add_argument("--max-batch", type=int, default=8, help="frames per YOLO forward pass at most")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="how long the first frame of a batch waits for others")
+    args = parser.parse_args()
+    if web is None:
+        raise SystemExit("The inference server needs aiohttp: pip install aiohttp")
+
+    print("Loading models...")
+    analyzer = Analyzer(args.input_size)
+    batcher = MicroBatcher(analyzer, args.max_batch, args.max_wait_ms / 1000)
+    web.run_app(make_app(batcher), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Intent matching over phrase -> response tables such as default_responses.json.
+
+The table is indexed once. A normalized phrase is looked up in a hash
+first; otherwise the query's words and character trigrams are scored
+against a TF-IDF inverted index, so reworded or misheard commands still
+find their intent. Response templates are split into literal text and
+placeholders when the index is built, so answering only fills in values.
+
+    index = IntentIndex.load("default_responses.json")
+    index.respond("what is the time")   # "The current time is 04:05 PM."
+"""
+import json
+import math
+import re
+import string
+from datetime import datetime
+
+import numpy as np
+
+RESPONSES_PATH = "default_responses.json"
+
+# Values for the placeholders used in response templates
+PLACEHOLDERS = {
+    "current_time": lambda now: now.strftime("%I:%M %p"),
+    "current_date": lambda now: now.strftime("%B %d, %Y"),
+    "current_day": lambda now: now.strftime("%A"),
+    "current_month": lambda now: now.strftime("%B"),
+    "current_year": lambda now: str(now.year),
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize(text):
+    """Lowercase, drop punctuation (what's -> whats) and collapse whitespace."""
+    return " ".join(_NON_WORD.sub("", text.lower().replace("-", " ")).split())
+
+
+def features(normalized):
+    """Words plus character trigrams of each padded word; trigrams absorb small recognition errors."""
+    words = normalized.split()
+    grams = []
+    for word in words:
+        padded = f" {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return ["w:" + word for word in words] + grams
+
+
+class Template:
+    """A response split once into literal text and placeholder names."""
+
+    __slots__ = ("text", "parts", "fields")
+
+    def __init__(self, text):
+        self.text = text
+        self.parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(text)]
+        self.fields = {field for _, field in self.parts if field}
+
+    def render(self, values=None, now=None):
+        """
+        Fill the placeholders.
+        :param values: Dict of placeholder values; missing PLACEHOLDERS are computed from now.
+        """
+        if not self.fields:
+            return self.text
+        values = dict(values or {})
+        missing = self.fields - values.keys()
+        if missing:
+            now = now or datetime.now()
+            for field in missing:
+                values[field] = PLACEHOLDERS[field](now) if field in PLACEHOLDERS else "{" + field + "}"
+        return "".join(literal + (str(values[field]) if field else "") for literal, field in self.parts)
+
+
+class IntentIndex:
+    """
+    Exact and fuzzy lookup of intents.
+
+    :param responses: Dict of phrase -> response template.
+    :param min_score: Cosine similarity below which a fuzzy match counts as no match.
+    """
+
+    def __init__(self, responses, min_score=0.5):
+        self.min_score = min_score
+        self.phrases = list(responses)
+        self.templates = [Template(responses[phrase]) for phrase in self.phrases]
+        self.exact = {}
+        for intent_id, phrase in enumerate(self.phrases):
+            self.exact.setdefault(normalize(phrase), intent_id)
+        self._build()
+        self._stale = False
+
+    @classmethod
+    def load(cls, path=RESPONSES_PATH, **kwargs):
+        with open(path, "r") as f:
+            return cls(json.load(f), **kwargs)
+
+    def add(self, phrase, response):
+        """
+        Add or replace one intent. Exact lookups see it at once; the fuzzy
+        index is rebuilt on the next query that needs it.
+        """
+        normalized = normalize(phrase)
+        intent_id = self.exact.get(normalized)
+        if intent_id is not None:
+            self.templates[intent_id] = Template(response)
+            return
+        self.exact[normalized] = len(self.phrases)
+        self.phrases.append(phrase)
+        self.templates.append(Template(response))
+        self._stale = True
+
+    def _build(self):
+        count = len(self.phrases)
+        counts = [_counts(features(normalize(phrase))) for phrase in self.phrases]
+        document_frequency = {}
+        for feature_counts in counts:
+            for feature in feature_counts:
+                document_frequency[feature] = document_frequency.get(feature, 0) + 1
+        self.idf = {feature: math.log((1 + count) / (1 + df)) + 1 for feature, df in document_frequency.items()}
+
+        postings = {}
+        for intent_id, feature_counts in enumerate(counts):
+            weights = {feature: tf * self.idf[feature] for feature, tf in feature_counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for feature, weight in weights.items():
+                postings.setdefault(feature, ([], []))
+                postings[feature][0].append(intent_id)
+                postings[feature][1].append(weight / norm)
+        # All posting lists laid end to end; feature f owns [offsets[f], offsets[f + 1]),
+        # so a query gathers a few slices and sums them per intent with one bincount
+        self.feature_index = {feature: index for index, feature in enumerate(postings)}
+        lengths = [len(ids) for ids, _ in postings.values()]
+        self._offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self._offsets[1:])
+        self._ids = np.fromiter((i for ids, _ in postings.values() for i in ids), dtype=np.intp,
+                                count=self._offsets[-1])
+        self._weights = np.fromiter((w for _, weights in postings.values() for w in weights), dtype=np.float64,
+                                    count=self._offsets[-1])
+
+    def match(self, text):
+        """
+        Find the intent for a command.
+        :return: Tuple (phrase, score); (None, best score) when nothing is close enough.
+        """
+        intent_id, score = self._best(normalize(text))
+        return (self.phrases[intent_id] if intent_id is not None else None), score
+
+    def exact_match(self, text):
+        """The phrase whose normalized form equals the text's, or None; no fuzzy lookup."""
+        intent_id = self.exact.get(normalize(text))
+        return self.phrases[intent_id] if intent_id is not None else None
+
+    def respond(self, text, values=None, now=None):
+        """The filled-in response for a command, or None when no intent matches."""
+        intent_id, _ = self._best(normalize(text))
+        if intent_id is None:
+            return None
+        return self.templates[intent_id].render(values, now)
+
+    def _best(self, normalized):
+        intent_id = self.exact.get(normalized)
+        if intent_id is not None:
+            return intent_id, 1.0
+        if self._stale:
+            self._build()
+            self._stale = False
+
+        query = {feature: tf * self.idf[feature] for feature, tf in _counts(features(normalized)).items()
+                 if feature in self.idf}
+        if not query:
+            return None, 0.0
+        norm = math.sqrt(sum(w * w for w in query.values()))
+        spans = [(self.feature_index[feature], weight / norm) for feature, weight in query.items()]
+        offsets = self._offsets
+        ids = np.concatenate([self._ids[offsets[f]:offsets[f + 1]] for f, _ in spans])
+        weights = np.concatenate([self._weights[offsets[f]:offsets[f + 1]] * weight for f, weight in spans])
+        scores = np.bincount(ids, weights, minlength=len(self.phrases))
+        best = int(scores.argmax())
+        score = float(scores[best])
+        if score < self.min_score:
+            return None, score
+        return best, score
+
+
+def _counts(items):
+    counts = {}
+    for item in items:
+        counts[item] = counts.get(item, 0) + 1
+    return counts
@@ -0,0 +1,100 @@
+"""
+Landmark adapter: MediaPipe results into reusable float32 NumPy arrays.
+
+Rather than walking hundreds of protobuf objects in Python, the landmark
+list is serialized once in C++ and its fixed-size records are read straight
+into a preallocated (N, 4) array of x, y, z, visibility. Lists whose records
+do not have a uniform layout fall back to a single Python pass that still
+writes into the same buffer.
+"""
+import numpy as np
+
+POSE_LANDMARKS = 33
+FACE_LANDMARKS = 468
+
+# MediaPipe PoseLandmark indices used by the rule-based consumers
+NOSE = 0
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+
+# NormalizedLandmark proto field number -> column
+_COLUMNS = {1: 0, 2: 1, 3: 2, 4: 3}
+
+
+def _read_serialized(data, count, out):
+    """Fill out from a serialized NormalizedLandmarkList; False if the layout is not uniform."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if count == 0 or len(raw) < 2 or raw[0] != 0x0A or raw[1] >= 0x80 or raw[1] % 5:
+        return False
+    record = 2 + int(raw[1])
+    if len(raw) != record * count:
+        return False
+    records = raw.reshape(count, record)
+    tags = records[0, 2::5]
+    if not (records[:, :2] == records[0, :2]).all() or not (records[:, 2::5] == tags).all():
+        return False
+    if ((tags & 7) != 5).any():  # every field must be a fixed32 float
+        return False
+
+    out[:] = 0
+    for index, tag in enumerate(tags):
+        column = _COLUMNS.get(int(tag) >> 3)
+        if column is not None:
+            out[:, column] = np.ndarray((count,), dtype="<f4", buffer=data, offset=3 + 5 * index,
+                                        strides=(record,))
+    return True
+
+
+class LandmarkArray:
+    """
+    Preallocated landmark buffer shared by every consumer of one result.
+
+    :param capacity: Landmarks expected per result (33 for pose, 468 for a face).
+    """
+
+    def __init__(self, capacity):
+        self.points = np.zeros((capacity, 4), dtype=np.float32)
+        self._features = np.zeros(capacity * 2, dtype=np.float32)
+        self.count = 0
+
+    def fill(self, landmark_list):
+        """
+        Copy a NormalizedLandmarkList (e.g. results.pose_landmarks) into the buffer.
+        :return: View of shape (count, 4) with columns x, y, z, visibility.
+        """
+        count = len(landmark_list.landmark)
+        if count > len(self.points):
+            self.points = np.zeros((count, 4), dtype=np.float32)
+            self._features = np.zeros(count * 2, dtype=np.float32)
+        self.count = count
+        out = self.points[:count]
+        if not _read_serialized(landmark_list.SerializeToString(), count, out):
+            for row, lm in zip(out, landmark_list.landmark):
+                row[0], row[1], row[2], row[3] = lm.x, lm.y, lm.z, lm.visibility
+        return out
+
+    def xy_features(self, layout="interleaved"):
+        """
+        x/y coordinates flattened for the expression classifier, in a reused buffer.
+        :param layout: "interleaved" (x0, y0, x1, y1, ...) or "planar" (x0, x1, ..., y0, y1, ...).
+        """
+        count = self.count
+        features = self._features[:count * 2]
+        if layout == "interleaved":
+            np.copyto(features.reshape(count, 2), self.points[:count, :2])
+        else:
+            np.copyto(features.reshape(2, count), self.points[:count, :2].T)
+        return features
+
+
+def infer_action(points):
+    """Rule-based action from a pose landmark array."""
+    if points is None or len(points) == 0:
+        return "No action detected"
+    nose_y = points[NOSE, 1]
+    left_y, right_y = points[LEFT_WRIST, 1], points[RIGHT_WRIST, 1]
+    if left_y < nose_y and right_y < nose_y:
+        return "Hands raised"
+    elif left_y > nose_y and right_y > nose_y:
+        return "Hands lowered"
+    return "Neutral position"
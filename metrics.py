@@ -0,0 +1,176 @@
+"""
+Per-stage timing histograms with a Prometheus endpoint and a frame overlay.
+
+Hot paths wrap themselves in metrics.timer("stage") or decorate functions
+with @metrics.timed("stage"). Nothing is recorded until enable() is called;
+while disabled, timer() hands back one shared no-op context manager, so the
+cost is a function call and a flag check.
+
+    python camera_integrated.py --metrics-port 9100 --overlay
+    curl localhost:9100/metrics
+"""
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL = nullcontext()
+
+
+class Histogram:
+    """Bucketed durations for one stage, plus the most recent value for the overlay."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.last = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        self.last = seconds
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start)
+
+
+class Registry:
+    """Thread-safe set of stage histograms."""
+
+    def __init__(self):
+        self.enabled = False
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def timer(self, name):
+        """Context manager timing one stage run."""
+        return _Timer(self, name) if self.enabled else _NULL
+
+    def timed(self, name):
+        """Decorator timing every call of a function as stage `name`."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def last_ms(self):
+        """Most recent duration per stage in milliseconds."""
+        with self._lock:
+            return {name: 1000 * histogram.last for name, histogram in self._histograms.items()}
+
+    def render(self):
+        """All histograms in the Prometheus text exposition format."""
+        lines = ["# HELP stage_seconds Time spent in each pipeline stage.", "# TYPE stage_seconds histogram"]
+        with self._lock:
+            for name, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'stage_seconds_bucket{{stage="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'stage_seconds_sum{{stage="{name}"}} {histogram.sum!r}')
+                lines.append(f'stage_seconds_count{{stage="{name}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=9100, host="127.0.0.1"):
+        """Expose /metrics on a background HTTP server; calling it again is a no-op."""
+        if self._server is not None:
+            return self._server
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Metrics on http://{host}:{port}/metrics")
+        return self._server
+
+    def draw_overlay(self, frame, origin=(10, 150)):
+        """Write the latest milliseconds of every stage onto a BGR frame."""
+        x, y = origin
+        for name, ms in sorted(self.last_ms().items()):
+            cv2.putText(frame, f"{name}: {ms:.1f} ms", (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+            y += 18
+
+
+registry = Registry()
+
+
+def enable(port=None):
+    """Start recording; with a port, also serve /metrics on it."""
+    registry.enabled = True
+    if port:
+        registry.serve(port)
+
+
+def configure(port=None):
+    """Enable metrics when a port is given or the METRICS_PORT environment variable is set."""
+    port = port or int(os.environ.get("METRICS_PORT", 0))
+    if port:
+        enable(port)
+    return registry.enabled
+
+
+def enabled():
+    return registry.enabled
+
+
+def timer(name):
+    return registry.timer(name)
+
+
+def timed(name):
+    return registry.timed(name)
+
+
+def draw_overlay(frame, origin=(10, 150)):
+    registry.draw_overlay(frame, origin)
@@ -0,0 +1,105 @@
+"""
+Process-wide registry of lazily loaded models.
+
+Each model is imported and built the first time get() asks for it and then
+shared by every caller in the process. Streamlit reruns the app script on
+every interaction but keeps imported modules, so models held here survive
+reruns the same way st.cache_resource entries do, and scripts outside
+Streamlit get the same behaviour. warm_up() builds models on a background
+thread so the first page renders before the weights are loaded.
+"""
+import threading
+
+_loaders = {}
+_instances = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def register(name):
+    """Decorator registering fn(*args) -> model under name."""
+    def decorate(loader):
+        _loaders[name] = loader
+        return loader
+    return decorate
+
+
+def get(name, *args):
+    """
+    Return the shared instance of a model, loading it on first use.
+    :param args: Loader arguments; each distinct combination is its own instance.
+    """
+    key = (name, args)
+    instance = _instances.get(key)
+    if instance is not None:
+        return instance
+    with _registry_lock:
+        lock = _locks.setdefault(key, threading.Lock())
+    # Per-model lock: concurrent callers wait for one load, other models load in parallel
+    with lock:
+        if key not in _instances:
+            _instances[key] = _loaders[name](*args)
+        return _instances[key]
+
+
+def is_loaded(name, *args):
+    return (name, args) in _instances
+
+
+def warm_up(*names):
+    """
+    Load models on a daemon thread.
+    :param names: Model names, or (name, args) tuples for models with loader arguments.
+    :return: The started thread.
+    """
+    def run():
+        for entry in names:
+            name, args = (entry, ()) if isinstance(entry, str) else entry
+            try:
+                get(name, *args)
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {e!r}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+# Models; heavy libraries are imported inside the loaders
+@register("yolo")
+def load_yolo(input_size=416):
+    from detection import Detector
+    return Detector(input_size=input_size)
+
+
+@register("expression")
+def load_expression(csv_path="facial_expression_data_new.csv"):
+    from expression_model import load_or_build
+    return load_or_build(csv_path)
+
+
+@register("pose")
+def load_pose(static_image_mode=False):
+    """static_image_mode=True treats every frame on its own, for frames from unrelated sources."""
+    import mediapipe
+    return mediapipe.solutions.pose.Pose(static_image_mode=static_image_mode)
+
+
+@register("face_mesh")
+def load_face_mesh(static_image_mode=False):
+    import mediapipe
+    return mediapipe.solutions.face_mesh.FaceMesh(static_image_mode=static_image_mode, refine_landmarks=False,
+                                                  max_num_faces=1)
+
+
+@register("distance")
+def load_distance(names_path="coco.names"):
+    from Distance import DistanceEstimator
+    from detection import load_classes
+    return DistanceEstimator(load_classes(names_path))
+
+
+@register("ocr")
+def load_ocr():
+    from ocr_pool import get_pool
+    return get_pool()
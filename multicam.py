@@ -0,0 +1,137 @@
+"""
+Run YOLO over several cameras, video files or RTSP streams at once.
+
+Frames from every source are batched into a single forward pass per round
+and the detections are routed back to each stream's overlay and spoken
+feedback. --separate runs the same sources as one single-stream process
+each instead, for comparing throughput against batching.
+
+    python multicam.py 0 1 clip.mp4 rtsp://camera.local/stream
+    python multicam.py clip.mp4 clip.mp4 clip.mp4 --no-display --mute --max-frames 300
+    python multicam.py clip.mp4 clip.mp4 clip.mp4 --no-display --mute --max-frames 300 --separate
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+import speech
+from detection import Detector, describe
+
+
+def open_source(spec):
+    """Camera index for numeric specs, otherwise a file path or stream URL."""
+    cap = cv2.VideoCapture(int(spec) if spec.isdigit() else spec)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video source {spec!r}.")
+    return cap
+
+
+def read_all(captures):
+    """Grab every source first and decode afterwards so the frames line up in time."""
+    grabbed = [cap.grab() for cap in captures]
+    frames = []
+    for ok, cap in zip(grabbed, captures):
+        ret, frame = cap.retrieve() if ok else (False, None)
+        frames.append(frame if ret else None)
+    return frames
+
+
+def run_separate(args):
+    """
+    Baseline: one single-stream process per source, all running at once.
+    :return: Total frames per second, the sum of each process's rate.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--no-display", "--mute",
+               "--input-size", str(args.input_size)]
+    if args.max_frames:
+        command += ["--max-frames", str(args.max_frames)]
+    processes = [subprocess.Popen(command + [spec], stdout=subprocess.PIPE, text=True) for spec in args.sources]
+    total = 0.0
+    for camera, (spec, process) in enumerate(zip(args.sources, processes), 1):
+        output, _ = process.communicate()
+        match = re.search(r"\(([\d.]+) fps total\)", output)
+        if process.returncode != 0 or match is None:
+            raise RuntimeError(f"Process for camera {camera} ({spec}) failed.")
+        print(f"Camera {camera} - {spec}: {match.group(1)} fps")
+        total += float(match.group(1))
+    print(f"{len(processes)} separate processes: {total:.1f} fps total")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+",
+                        help="camera indices, video files or RTSP URLs; a repeated source is a separate stream")
+    parser.add_argument("--input-size", type=int, default=416, choices=Detector.INPUT_SIZES)
+    parser.add_argument("--no-display", action="store_true", help="skip the preview windows")
+    parser.add_argument("--mute", action="store_true", help="skip spoken feedback")
+    parser.add_argument("--max-frames", type=int, default=0, help="stop each stream after this many frames")
+    parser.add_argument("--separate", action="store_true",
+                        help="run one single-stream process per source instead of batching, for comparison")
+    args = parser.parse_args()
+
+    if args.separate:
+        run_separate(args)
+        return
+
+    detector = Detector(input_size=args.input_size)
+    classes = detector.classes
+    colors = np.random.uniform(0, 255, size=(len(classes), 3))
+    # Streams are numbered by position, so the same file given twice is two streams
+    streams = [(camera, spec, open_source(spec)) for camera, spec in enumerate(args.sources, 1)]
+    counts = {camera: 0 for camera, _, _ in streams}
+
+    frames_done = 0
+    start = time.perf_counter()
+    try:
+        while streams:
+            frames = read_all([cap for _, _, cap in streams])
+            live, still_open = [], []
+            for (camera, spec, cap), frame in zip(streams, frames):
+                if frame is None or (args.max_frames and counts[camera] >= args.max_frames):
+                    print(f"Stream {camera} ({spec}) ended.")
+                    cap.release()
+                    continue
+                counts[camera] += 1
+                still_open.append((camera, spec, cap))
+                live.append((camera, spec, frame))
+            streams = still_open
+            if not live:
+                break
+
+            results = detector.detect_batch([frame for _, _, frame in live])
+            for (camera, spec, frame), (boxes, confidences, class_ids) in zip(live, results):
+                for (x, y, w, h), confidence, class_id in zip(boxes.tolist(), confidences, class_ids):
+                    color = colors[class_id]
+                    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+                    cv2.putText(frame, f"{classes[class_id]} {confidence:.2f}", (x, y - 10),
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+                if len(boxes) and not args.mute:
+                    description = describe(classes, boxes, class_ids, frame.shape[1])
+                    speech.say(f"Camera {camera}: {description}", key=f"objects-{camera}")
+                if not args.no_display:
+                    cv2.imshow(f"Camera {camera} - {spec}", frame)
+
+            frames_done += len(live)
+            if not args.no_display and cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    finally:
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            print(f"{frames_done} frames from {len(args.sources)} streams in {elapsed:.1f} s "
+                  f"({frames_done / elapsed:.1f} fps total)")
+        for _, _, cap in streams:
+            cap.release()
+        cv2.destroyAllWindows()
+        if not args.mute:
+            speech.get_service().stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Pool of long-lived Tesseract engines.
+
+With the tesserocr binding installed, each worker keeps its own initialised
+Tesseract API for the life of the pool and images are handed over as raw
+pixel buffers. Without it, each crop is PNG-encoded in memory and piped to
+a `tesseract stdin stdout` process, which still avoids pytesseract's
+temporary files. Either way recognize_batch() runs the crops in parallel.
+"""
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+import metrics
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+
+class TesseractPool:
+    """
+    :param workers: Parallel engines; defaults to the CPU count.
+    :param lang: Tesseract language code.
+    :param psm: Default page segmentation mode (3 = auto, 7 = single text line).
+    """
+
+    def __init__(self, workers=None, lang="eng", psm=3):
+        self.workers = workers or os.cpu_count() or 1
+        self.lang = lang
+        self.psm = psm
+        self.backend = "tesserocr" if tesserocr is not None else "cli"
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="tesseract")
+        self._apis = queue.Queue()
+        if tesserocr is not None:
+            for _ in range(self.workers):
+                self._apis.put(tesserocr.PyTessBaseAPI(lang=lang, psm=psm))
+
+    def recognize(self, image, psm=None):
+        """OCR one grey or BGR image array and return its text."""
+        image = _to_gray(image)
+        with metrics.timer("ocr"):
+            if self.backend == "tesserocr":
+                return self._recognize_api(image, psm)
+            return self._recognize_cli(image, psm)
+
+    def recognize_batch(self, images, psm=None):
+        """OCR many crops in parallel; texts come back in input order."""
+        return list(self._executor.map(lambda image: self.recognize(image, psm), images))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while not self._apis.empty():
+            self._apis.get().End()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _recognize_api(self, image, psm):
+        api = self._apis.get()
+        try:
+            api.SetPageSegMode(self.psm if psm is None else psm)
+            height, width = image.shape
+            api.SetImageBytes(image.tobytes(), width, height, 1, width)
+            return api.GetUTF8Text()
+        finally:
+            self._apis.put(api)
+
+    def _recognize_cli(self, image, psm):
+        ok, png = cv2.imencode(".png", image)
+        if not ok:
+            raise ValueError("Could not encode image for Tesseract.")
+        command = ["tesseract", "stdin", "stdout", "-l", self.lang, "--psm", str(self.psm if psm is None else psm)]
+        result = subprocess.run(command, input=png.tobytes(), capture_output=True, check=True)
+        return result.stdout.decode("utf-8", errors="replace")
+
+
+def _to_gray(image):
+    image = np.asarray(image)
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return np.ascontiguousarray(image, dtype=np.uint8)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide Tesseract pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = TesseractPool()
+        return _pool
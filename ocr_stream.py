@@ -0,0 +1,172 @@
+"""
+Continuous OCR on a background worker.
+
+Each submitted frame is searched for text lines, every line is fingerprinted
+with a difference hash, and only lines whose hash has not been seen recently
+are sent to Tesseract, together as one batch on the shared engine pool.
+Recognized text is cached by hash, so a static sign is OCRed once and
+reported once instead of every frame.
+"""
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+def find_text_regions(gray, max_regions=12, min_area=200):
+    """
+    Candidate text lines in a grey frame.
+
+    Character strokes show up as dense morphological gradient; the
+    thresholded gradient is closed horizontally so neighbouring characters
+    merge into lines, and boxes that are mostly empty (plain edges, object
+    outlines) are discarded.
+    :return: List of x, y, w, h boxes, largest first.
+    """
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, strokes = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    lines = cv2.morphologyEx(strokes, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3)))
+    contours, _ = cv2.findContours(lines, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w * h < min_area or h < 8 or w < h:
+            continue
+        if cv2.countNonZero(strokes[y:y + h, x:x + w]) / (w * h) > 0.15:
+            boxes.append((x, y, w, h))
+    boxes.sort(key=lambda box: box[2] * box[3], reverse=True)
+    return boxes[:max_regions]
+
+
+def dhash(gray_crop, size=8):
+    """64-bit difference hash; nearly identical crops get identical hashes."""
+    small = cv2.resize(gray_crop, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def tesseract_recognize_batch(crops):
+    """OCR text-line crops in parallel on the shared Tesseract pool."""
+    from ocr_pool import get_pool
+    return get_pool().recognize_batch(crops, psm=7)
+
+
+class TextCache:
+    """Least-recently-used map from region hash to recognized text."""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        return None
+
+    def put(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class StreamingOCR:
+    """
+    Background OCR over a stream of frames.
+
+    :param recognize: Callable taking a grey crop and returning text; when omitted,
+        new crops are OCRed together on the shared Tesseract pool.
+    :param on_text: Called from the worker thread with each newly seen, non-empty text.
+    :param on_error: Called from the worker thread with the exception when a frame fails;
+        the worker keeps going with the next frame. Errors are printed when omitted.
+    :param cache_size: Region hashes remembered.
+    """
+
+    def __init__(self, recognize=None, on_text=None, on_error=None, cache_size=256):
+        if recognize is not None:
+            self.recognize_batch = lambda crops: [recognize(crop) for crop in crops]
+        else:
+            self.recognize_batch = tesseract_recognize_batch
+        self.on_text = on_text
+        self.on_error = on_error
+        self.last_error = None
+        self.errors = 0
+        self.cache = TextCache(cache_size)
+        self.regions = []
+        self.ocr_calls = 0
+        self.cache_hits = 0
+        self._frame = None
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self._reported = TextCache(cache_size)
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def submit(self, frame):
+        """Hand over the newest frame; a frame not yet picked up is replaced."""
+        with self._cond:
+            self._frame = frame
+            self._cond.notify()
+
+    def process(self, frame):
+        """
+        OCR the text regions of one BGR frame, reusing cached text for unchanged regions.
+        :return: List of (box, text) pairs.
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        boxes = find_text_regions(gray)
+        keys = [dhash(gray[y:y + h, x:x + w]) for x, y, w, h in boxes]
+        texts = [self.cache.get(key) for key in keys]
+
+        # Regions not in the cache go to Tesseract as one parallel batch
+        missing = [i for i, text in enumerate(texts) if text is None]
+        if missing:
+            crops = [gray[y:y + h, x:x + w] for x, y, w, h in (boxes[i] for i in missing)]
+            for i, text in zip(missing, self.recognize_batch(crops)):
+                texts[i] = text.strip()
+                self.cache.put(keys[i], texts[i])
+            self.ocr_calls += len(missing)
+        self.cache_hits += len(boxes) - len(missing)
+
+        regions = []
+        for box, text in zip(boxes, texts):
+            if text:
+                regions.append((box, text))
+                if self._reported.get(text) is None:
+                    self._reported.put(text, True)
+                    if self.on_text is not None:
+                        self.on_text(text)
+        self.regions = regions
+        return regions
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._frame is not None or not self._running)
+                if not self._running:
+                    return
+                frame, self._frame = self._frame, None
+            # A failing frame (tesseract missing, a CLI error) must not end the thread
+            try:
+                self.process(frame)
+            except Exception as e:
+                self.last_error = e
+                self.errors += 1
+                if self.on_error is not None:
+                    self.on_error(e)
+                else:
+                    print(f"OCR failed on a frame: {e!r}")
@@ -0,0 +1,241 @@
+import threading
+import time
+from collections import deque
+
+import metrics
+
+
+class FramePacket:
+    """A captured frame travelling through the pipeline."""
+
+    def __init__(self, frame_id, image):
+        self.frame_id = frame_id
+        self.captured_at = time.perf_counter()
+        self.image = image
+        self.views = {}
+
+
+class StageStats:
+    """Throughput counters for a single pipeline stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.dropped = 0
+        self.busy_time = 0.0
+        self.started_at = time.perf_counter()
+
+    def record(self, elapsed):
+        self.processed += 1
+        self.busy_time += elapsed
+
+    def fps(self):
+        elapsed = time.perf_counter() - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def mean_ms(self):
+        return 1000 * self.busy_time / self.processed if self.processed else 0.0
+
+    def __str__(self):
+        return (f"{self.name}: {self.fps():.1f} fps, {self.mean_ms():.1f} ms/frame, "
+                f"{self.processed} processed, {self.dropped} dropped")
+
+
+class FrameRing:
+    """Bounded ring of the most recent frames; old frames fall off the end."""
+
+    def __init__(self, size=2):
+        self._frames = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, packet):
+        """Add a frame and return True if an unconsumed frame was overwritten."""
+        with self._cond:
+            dropped = len(self._frames) == self._frames.maxlen
+            self._frames.append(packet)
+            self._cond.notify_all()
+            return dropped
+
+    def take_latest(self, timeout=None):
+        """Remove and return the newest frame, discarding any older ones."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frames or self._closed, timeout):
+                return None, 0
+            if not self._frames:
+                return None, 0
+            packet = self._frames.pop()
+            stale = len(self._frames)
+            self._frames.clear()
+            return packet, stale
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class FramePipeline:
+    """
+    Runs capture, model stages and composition on separate threads.
+
+    The capture thread keeps only the newest frames in a small ring. The
+    dispatcher hands the newest frame to every stage at once so the models run
+    concurrently on the same image, and the compositor merges stage results by
+    frame ID. Frames that arrive while the stages are busy are dropped rather
+    than queued, so latency stays bounded by the slowest stage.
+
+    :param source: Object with a cv2.VideoCapture-style read() method.
+    :param stages: Dict mapping stage name to a callable taking a FramePacket.
+    :param prepare: Optional callable run on each packet before dispatch.
+    :param ring_size: Number of captured frames kept waiting for dispatch.
+    :param max_in_flight: Frames allowed inside the stages at the same time.
+    """
+
+    def __init__(self, source, stages, prepare=None, ring_size=2, max_in_flight=2):
+        self.source = source
+        self.stages = dict(stages)
+        self.prepare = prepare
+        self.max_in_flight = max_in_flight
+
+        self._ring = FrameRing(ring_size)
+        self._inputs = {name: deque() for name in self.stages}
+        self._input_cond = threading.Condition()
+        self._pending = {}
+        self._pending_cond = threading.Condition()
+        self._output = None
+        self._output_cond = threading.Condition()
+        self._running = threading.Event()
+        self._error = None
+        self._threads = []
+        self.end_of_stream = False
+
+        self.capture_stats = StageStats("capture")
+        self.stage_stats = {name: StageStats(name) for name in self.stages}
+        self.output_stats = StageStats("compositor")
+
+    def start(self):
+        self._running.set()
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True),
+                         threading.Thread(target=self._dispatch_loop, daemon=True)]
+        for name in self.stages:
+            self._threads.append(threading.Thread(target=self._stage_loop, args=(name,), daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        self._ring.close()
+        for cond in (self._input_cond, self._pending_cond, self._output_cond):
+            with cond:
+                cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def get(self, timeout=1.0):
+        """
+        Wait for the next composited frame.
+        :return: Tuple (packet, results), or None on timeout or once stopped.
+        """
+        with self._output_cond:
+            self._output_cond.wait_for(lambda: self._output is not None or not self._running.is_set(), timeout)
+            if self._error is not None:
+                raise self._error
+            item, self._output = self._output, None
+            return item
+
+    def is_running(self):
+        return self._running.is_set()
+
+    def report(self):
+        """Per-stage throughput, one line per stage."""
+        lines = [str(self.capture_stats)]
+        lines += [str(stats) for stats in self.stage_stats.values()]
+        lines.append(str(self.output_stats))
+        return "\n".join(lines)
+
+    def _fail(self, error):
+        if error is not None:
+            self._error = error
+        self._running.clear()
+        self._ring.close()
+        with self._output_cond:
+            self._output_cond.notify_all()
+
+    def _capture_loop(self):
+        frame_id = 0
+        while self._running.is_set():
+            start = time.perf_counter()
+            with metrics.timer("capture"):
+                ret, image = self.source.read()
+            if not ret:
+                self.end_of_stream = True
+                self._fail(None)
+                return
+            frame_id += 1
+            self.capture_stats.record(time.perf_counter() - start)
+            if self._ring.push(FramePacket(frame_id, image)):
+                self.capture_stats.dropped += 1
+
+    def _dispatch_loop(self):
+        while self._running.is_set():
+            with self._pending_cond:
+                self._pending_cond.wait_for(
+                    lambda: len(self._pending) < self.max_in_flight or not self._running.is_set())
+            packet, stale = self._ring.take_latest(timeout=0.5)
+            if packet is None:
+                continue
+            self.capture_stats.dropped += stale
+            try:
+                if self.prepare is not None:
+                    self.prepare(packet)
+            except Exception as e:
+                self._fail(e)
+                return
+            with self._pending_cond:
+                self._pending[packet.frame_id] = (packet, {})
+            with self._input_cond:
+                for queue in self._inputs.values():
+                    queue.append(packet)
+                self._input_cond.notify_all()
+
+    def _stage_loop(self, name):
+        func = self.stages[name]
+        queue = self._inputs[name]
+        stats = self.stage_stats[name]
+        while True:
+            with self._input_cond:
+                self._input_cond.wait_for(lambda: queue or not self._running.is_set())
+                if not self._running.is_set():
+                    return
+                packet = queue.popleft()
+            start = time.perf_counter()
+            try:
+                result = func(packet)
+            except Exception as e:
+                self._fail(e)
+                return
+            stats.record(time.perf_counter() - start)
+            self._composite(packet.frame_id, name, result)
+
+    def _composite(self, frame_id, name, result):
+        with self._pending_cond:
+            packet, results = self._pending[frame_id]
+            results[name] = result
+            if len(results) < len(self.stages):
+                return
+            del self._pending[frame_id]
+            self._pending_cond.notify_all()
+        self.output_stats.record(time.perf_counter() - packet.captured_at)
+        with self._output_cond:
+            if self._output is not None:
+                self.output_stats.dropped += 1
+            self._output = (packet, results)
+            self._output_cond.notify_all()
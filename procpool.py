@@ -0,0 +1,247 @@
+"""
+Run each vision model family in its own worker process.
+
+Frames are written once into a ring of shared-memory slots and workers read
+them in place, so only a small handle (block name, shape, slot) crosses the
+process boundary on the way in. Results come back over a pipe in compact form (serialized landmark
+protobufs, NumPy box arrays) and are turned back into MediaPipe-style result
+objects on the caller's side.
+"""
+import multiprocessing as mp
+import threading
+import time
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+# Model families; each loader runs inside the worker and returns fn(frame) -> picklable result
+def load_pose(options):
+    import mediapipe
+    pose = mediapipe.solutions.pose.Pose()
+
+    def run(frame):
+        results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        return results.pose_landmarks.SerializeToString() if results.pose_landmarks else None
+    return run
+
+
+def load_face(options):
+    """FaceMesh together with the expression KNN, which only ever consumes its landmarks."""
+    import mediapipe
+    from expression_model import load_or_build
+    from landmarks import FACE_LANDMARKS, LandmarkArray
+
+    face_mesh = mediapipe.solutions.face_mesh.FaceMesh(refine_landmarks=False, max_num_faces=1)
+    knn = load_or_build(options.get("dataset_path", "facial_expression_data_new.csv"))
+    face_points = LandmarkArray(FACE_LANDMARKS)
+
+    def run(frame):
+        results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        faces, expressions = [], []
+        for face_landmarks in results.multi_face_landmarks or []:
+            face_points.fill(face_landmarks)
+            faces.append(face_landmarks.SerializeToString())
+            expressions.append(knn.predict(face_points.xy_features("interleaved")))
+        return faces, expressions
+    return run
+
+
+def load_yolo(options):
+    from detection import Detector
+    detector = Detector(input_size=options.get("input_size", 416))
+
+    def run(frame):
+        return detector.detect(frame, conf_threshold=0.5, nms_threshold=0.4)
+    return run
+
+
+FAMILIES = {"pose": load_pose, "face": load_face, "yolo": load_yolo}
+
+
+def pose_result(data):
+    """Rebuild a pose.process()-style result from a worker reply."""
+    from mediapipe.framework.formats import landmark_pb2
+    landmarks = landmark_pb2.NormalizedLandmarkList.FromString(data) if data is not None else None
+    return SimpleNamespace(pose_landmarks=landmarks)
+
+
+def face_result(data):
+    """Rebuild a (face_mesh.process()-style result, expressions) pair from a worker reply."""
+    from mediapipe.framework.formats import landmark_pb2
+    faces, expressions = data
+    landmarks = [landmark_pb2.NormalizedLandmarkList.FromString(face) for face in faces]
+    return SimpleNamespace(multi_face_landmarks=landmarks or None), expressions
+
+
+def _worker(family, options, conn):
+    try:
+        run = FAMILIES[family](options)
+    except Exception as e:
+        conn.send(("error", repr(e)))
+        conn.close()
+        return
+    conn.send(("ready", None))
+    block = None
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        shm_name, shape, slot = task
+        frames = None
+        try:
+            if block is None or block.name != shm_name:
+                # Frames moved to a new block after a resize; let go of the old one
+                if block is not None:
+                    block.close()
+                    block = None
+                block = shared_memory.SharedMemory(name=shm_name)
+            frames = np.ndarray(shape, dtype=np.uint8, buffer=block.buf)
+            conn.send(("ok", run(frames[slot])))
+        except Exception as e:
+            conn.send(("error", repr(e)))
+        finally:
+            # The array exports block.buf; it must be gone before the block can be closed
+            del frames
+    if block is not None:
+        block.close()
+
+
+class ProcessModelPool:
+    """
+    One worker process per model family, fed through shared-memory frame slots.
+
+    :param families: Names from FAMILIES to start.
+    :param options: Dict passed to every family loader (e.g. input_size).
+    :param slots: Frames that may be in flight at once; must exceed the
+        number of frames the caller processes concurrently.
+    :param start_timeout: Seconds to wait for every worker to load its models.
+    """
+
+    def __init__(self, families=("pose", "face", "yolo"), options=None, slots=4, start_timeout=300.0):
+        self.slots = slots
+        self._shm = None
+        self._shape = None
+        self._frames = None
+        self._next_slot = 0
+        self._written = 0
+        # Blocks by name: frames being processed, and blocks replaced by a resize
+        self._blocks = {}
+        self._active = {}
+        self._retired = {}
+        self._lock = threading.Lock()
+        self._conns = {}
+        self._locks = {}
+        self._processes = []
+
+        context = mp.get_context("spawn")
+        for family in families:
+            parent, child = context.Pipe()
+            process = context.Process(target=_worker, args=(family, options or {}, child), daemon=True)
+            process.start()
+            # Only the worker may hold the child end, so the parent sees EOF if the worker dies
+            child.close()
+            self._conns[family] = parent
+            self._locks[family] = threading.Lock()
+            self._processes.append(process)
+        try:
+            self._wait_ready(time.monotonic() + start_timeout)
+        except Exception:
+            self.close()
+            raise
+
+    def write(self, frame):
+        """Copy a frame into the next shared slot and return the handle to pass to run()."""
+        with self._lock:
+            if self._frames is None or frame.shape != self._shape[1:]:
+                self._allocate(frame.shape)
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self.slots
+            self._frames[slot] = frame
+            self._written += 1
+            self._release_retired()
+            return self._shm.name, self._shape, slot
+
+    def run(self, family, handle):
+        """Process a frame written by write() in one family's worker and wait for its result."""
+        name = handle[0]
+        with self._lock:
+            if name not in self._blocks:
+                raise RuntimeError("Frame is no longer available: its block was released after a resize.")
+            self._active[name] += 1
+        try:
+            with self._locks[family]:
+                conn = self._conns[family]
+                conn.send(handle)
+                try:
+                    status, result = conn.recv()
+                except EOFError:
+                    raise RuntimeError(f"{family} worker exited.") from None
+        finally:
+            with self._lock:
+                self._active[name] -= 1
+                self._release_retired()
+        if status == "error":
+            raise RuntimeError(f"{family} worker failed: {result}")
+        return result
+
+    def close(self):
+        for conn in self._conns.values():
+            try:
+                conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            for block in self._blocks.values():
+                block.close()
+                block.unlink()
+            self._blocks.clear()
+            self._shm = None
+            self._frames = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _wait_ready(self, deadline):
+        for (family, conn), process in zip(self._conns.items(), self._processes):
+            while not conn.poll(0.5):
+                if not process.is_alive():
+                    raise RuntimeError(f"Worker for {family} exited with code {process.exitcode} while starting.")
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Worker for {family} did not start in time.")
+            try:
+                status, detail = conn.recv()
+            except EOFError:
+                raise RuntimeError(f"Worker for {family} exited while starting.") from None
+            if status != "ready":
+                raise RuntimeError(f"Worker for {family} failed to start: {detail}")
+
+    def _allocate(self, shape):
+        # Workers attach to blocks by name, so a resize starts a new block; the old one is
+        # retired and unlinked once nothing runs on it and its slots would have been reused
+        if self._shm is not None:
+            self._retired[self._shm.name] = self._written
+        self._shape = (self.slots,) + tuple(shape)
+        self._shm = shared_memory.SharedMemory(create=True, size=int(np.prod(self._shape)))
+        self._frames = np.ndarray(self._shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._blocks[self._shm.name] = self._shm
+        self._active[self._shm.name] = 0
+        self._next_slot = 0
+
+    def _release_retired(self):
+        # Caller holds self._lock
+        for name, retired_at in list(self._retired.items()):
+            if self._active[name] == 0 and self._written - retired_at >= self.slots:
+                block = self._blocks.pop(name)
+                block.close()
+                block.unlink()
+                del self._retired[name], self._active[name]
@@ -0,0 +1,138 @@
+"""
+SQLite storage for reminders, so a restart of the assistant loses nothing.
+
+The database runs in WAL mode with synchronous=NORMAL: a commit appends to
+the write-ahead log without an fsync, and the log is synced at
+checkpoints. Writes are also grouped: each one runs at once inside an
+open transaction, which is committed after commit_every writes or
+commit_interval seconds, so adding reminders one after another by voice
+does not pay a commit each. Pending reminders are found through a partial
+index on fire time that leaves fired ones out, so the scheduler reads only
+the next stretch of reminders however long the history grows.
+
+    store = ReminderStore()
+    scheduler = ReminderScheduler(callback, store=store)
+"""
+import sqlite3
+import threading
+import time
+
+DB_PATH = "reminders.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminders (
+    id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    fire_at REAL NOT NULL,
+    daily INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS reminders_pending ON reminders (fire_at) WHERE done = 0;
+"""
+
+
+class ReminderStore:
+    """
+    :param commit_every: Uncommitted writes that trigger a commit.
+    :param commit_interval: Longest time in seconds a write stays uncommitted.
+    """
+
+    def __init__(self, path=DB_PATH, commit_every=64, commit_interval=1.0):
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._uncommitted = 0
+        self._closed = False
+        self._committer = threading.Thread(target=self._commit_loop, daemon=True)
+        self._committer.start()
+
+    def add(self, task, fire_at, daily=False):
+        """:return: The new reminder's id."""
+        with self._lock:
+            cursor = self._execute("INSERT INTO reminders (task, fire_at, daily) VALUES (?, ?, ?)",
+                                   (task, fire_at, int(daily)))
+            return cursor.lastrowid
+
+    def reschedule(self, reminder_id, fire_at):
+        with self._lock:
+            self._execute("UPDATE reminders SET fire_at = ? WHERE id = ?", (fire_at, reminder_id))
+
+    def mark_done(self, reminder_id):
+        with self._lock:
+            self._execute("UPDATE reminders SET done = 1 WHERE id = ?", (reminder_id,))
+
+    def delete(self, reminder_id):
+        with self._lock:
+            self._execute("DELETE FROM reminders WHERE id = ?", (reminder_id,))
+
+    def due_between(self, after, until):
+        """Pending (id, task, fire_at, daily) rows with after < fire_at <= until, soonest first."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT id, task, fire_at, daily FROM reminders WHERE done = 0 AND fire_at > ? AND fire_at <= ? "
+                "ORDER BY fire_at", (after, until)).fetchall()
+
+    def pending(self):
+        """Every pending row, soonest first."""
+        return self.due_between(float("-inf"), float("inf"))
+
+    def next_fire_at(self):
+        """Fire time of the soonest pending reminder, or None."""
+        with self._lock:
+            return self._connection.execute("SELECT MIN(fire_at) FROM reminders WHERE done = 0").fetchone()[0]
+
+    def commit(self):
+        with self._lock:
+            self._commit()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._commit()
+            self._wake.notify()
+        self._committer.join()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _execute(self, sql, parameters):
+        # Caller holds the lock; the statement joins the open transaction
+        if self._closed:
+            raise ValueError("ReminderStore is closed.")
+        cursor = self._connection.execute(sql, parameters)
+        self._uncommitted += 1
+        if self._uncommitted == 1 or self._uncommitted >= self.commit_every:
+            self._wake.notify()
+        return cursor
+
+    def _commit(self):
+        if self._uncommitted:
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def _commit_loop(self):
+        with self._lock:
+            while not self._closed:
+                if not self._uncommitted:
+                    self._wake.wait()
+                    continue
+                deadline = time.monotonic() + self.commit_interval
+                while not self._closed and self._uncommitted < self.commit_every:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if not self._closed:
+                    self._commit()
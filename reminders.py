@@ -0,0 +1,242 @@
+"""
+Reminder scheduler shared by the voice assistants.
+
+Reminders sit in a min-heap keyed on their absolute fire time, so adding
+one is O(log n) and the scheduler thread only ever looks at the head. The
+thread sleeps on a condition variable until the head is due; adding an
+earlier reminder wakes it to sleep again for the new, shorter time. Every
+reminder whose time has passed fires, however late the thread woke up, so
+a skipped minute boundary no longer loses it, and reminders set for the
+same minute each fire once.
+
+With a ReminderStore the reminders are also kept in SQLite and survive a
+restart; the heap then only holds the reminders due within the next
+horizon seconds and is refilled from the store's fire-time index as time
+moves on. Reminders that came due while the assistant was not running
+fire at start-up.
+
+The clock is injectable: run_pending() fires whatever is due at the
+clock's time without the thread, which makes the scheduler usable with a
+fake clock.
+
+    scheduler = ReminderScheduler(lambda reminder: speak(reminder.task))
+    scheduler.start()
+    scheduler.at("Take medicine", 21, 0, daily=True)
+"""
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class Reminder:
+    """
+    :param when: Fire time in seconds since the epoch.
+    :param daily: Fire again at the same local time every day.
+    """
+
+    __slots__ = ("task", "when", "daily", "cancelled", "id")
+
+    def __init__(self, task, when, daily=False, reminder_id=None):
+        self.task = task
+        self.when = when
+        self.daily = daily
+        self.cancelled = False
+        self.id = reminder_id
+
+    def time_text(self):
+        return datetime.fromtimestamp(self.when).strftime("%I:%M %p")
+
+    def __repr__(self):
+        return f"Reminder({self.task!r}, {datetime.fromtimestamp(self.when):%Y-%m-%d %H:%M}, daily={self.daily})"
+
+
+class ReminderScheduler:
+    """
+    :param callback: Called with each Reminder as it fires, on the scheduler thread.
+    :param clock: Function returning the current time in seconds since the epoch.
+    :param store: Optional ReminderStore that persists the reminders.
+    :param horizon: With a store, how many seconds ahead of the clock the heap is filled.
+    """
+
+    def __init__(self, callback, clock=time.time, store=None, horizon=3600):
+        self.callback = callback
+        self.clock = clock
+        self.store = store
+        self.horizon = horizon
+        self._heap = []
+        self._loaded = {}
+        self._ids = itertools.count()
+        # Reminders due up to this time are in the heap; later ones only in the store
+        self._loaded_until = float("inf") if store is None else float("-inf")
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._firing = 0
+        if store is not None:
+            with self._condition:
+                self._load(self.clock() + horizon)
+
+    def add(self, task, when, daily=False):
+        """
+        Schedule a reminder.
+        :param when: datetime or seconds since the epoch.
+        :return: The Reminder, which can be passed to cancel().
+        """
+        if isinstance(when, datetime):
+            when = when.timestamp()
+        with self._condition:
+            reminder_id = next(self._ids) if self.store is None else self.store.add(task, when, daily)
+            reminder = Reminder(task, when, daily, reminder_id)
+            if when <= self._loaded_until:
+                self._push(reminder)
+                # Only a new head changes how long the thread should sleep
+                if self._heap[0][2] is reminder:
+                    self._condition.notify_all()
+        return reminder
+
+    def at(self, task, hour, minute, daily=False):
+        """Schedule a reminder at the next occurrence of hour:minute, local time."""
+        return self.add(task, next_time_of_day(hour, minute, self.clock()), daily)
+
+    def cancel(self, reminder):
+        # Cancelled entries stay in the heap and are dropped when they reach the head
+        with self._condition:
+            reminder.cancelled = True
+            loaded = self._loaded.pop(reminder.id, None)
+            if loaded is not None:
+                loaded.cancelled = True
+            if self.store is not None:
+                self.store.delete(reminder.id)
+            self._condition.notify_all()
+
+    def pending(self):
+        """Reminders not yet fired, soonest first."""
+        with self._condition:
+            if self.store is not None:
+                return [Reminder(task, fire_at, bool(daily), reminder_id)
+                        for reminder_id, task, fire_at, daily in self.store.pending()]
+            return [reminder for _, _, reminder in sorted(self._heap) if not reminder.cancelled]
+
+    def next_due(self):
+        """Fire time of the next reminder, or None."""
+        with self._condition:
+            if self.store is not None:
+                return self.store.next_fire_at()
+            self._drop_cancelled()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now=None):
+        """
+        Fire every reminder due at now (the clock's time by default).
+        :return: The reminders fired, in order.
+        """
+        now = self.clock() if now is None else now
+        due = self._pop_due(now)
+        for reminder in due:
+            self.callback(reminder)
+        return due
+
+    def start(self):
+        if self._thread is not None:
+            return self._thread
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wait_idle(self, timeout=None):
+        """Block until no reminders are pending or firing; False if timeout ran out first."""
+        def idle():
+            if self._firing or not all(reminder.cancelled for _, _, reminder in self._heap):
+                return False
+            return self.store is None or self.store.next_fire_at() is None
+
+        with self._condition:
+            return self._condition.wait_for(lambda: idle() or not self._running, timeout)
+
+    def _pop_due(self, now):
+        due = []
+        with self._condition:
+            if now >= self._loaded_until:
+                self._load(now + self.horizon)
+            while self._heap and self._heap[0][0] <= now:
+                _, _, reminder = heapq.heappop(self._heap)
+                if reminder.cancelled:
+                    continue
+                del self._loaded[reminder.id]
+                due.append(reminder)
+                if reminder.daily:
+                    # A missed day fires once and moves on to the next future occurrence
+                    when = reminder.when
+                    while when <= now:
+                        when = (datetime.fromtimestamp(when) + timedelta(days=1)).timestamp()
+                    if self.store is not None:
+                        self.store.reschedule(reminder.id, when)
+                    if when <= self._loaded_until:
+                        self._push(Reminder(reminder.task, when, True, reminder.id))
+                elif self.store is not None:
+                    self.store.mark_done(reminder.id)
+            if due:
+                self._condition.notify_all()
+        return due
+
+    def _push(self, reminder):
+        heapq.heappush(self._heap, (reminder.when, reminder.id, reminder))
+        self._loaded[reminder.id] = reminder
+
+    def _load(self, until):
+        """Move the store's reminders due up to until into the heap; caller holds the condition."""
+        for reminder_id, task, fire_at, daily in self.store.due_between(self._loaded_until, until):
+            if reminder_id not in self._loaded:
+                self._push(Reminder(task, fire_at, bool(daily), reminder_id))
+        self._loaded_until = until
+
+    def _drop_cancelled(self):
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running:
+                    self._drop_cancelled()
+                    wake_at = min(self._heap[0][0] if self._heap else float("inf"), self._loaded_until)
+                    if wake_at == float("inf"):
+                        self._condition.wait()
+                        continue
+                    delay = wake_at - self.clock()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                if not self._running:
+                    return
+                self._firing += 1
+            try:
+                for reminder in self._pop_due(self.clock()):
+                    try:
+                        self.callback(reminder)
+                    except Exception as e:
+                        print(f"Reminder callback failed: {e!r}")
+            finally:
+                with self._condition:
+                    self._firing -= 1
+                    self._condition.notify_all()
+
+
+def next_time_of_day(hour, minute, now=None):
+    """Seconds since the epoch of the next hour:minute local time after now."""
+    now = datetime.fromtimestamp(time.time() if now is None else now)
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return target.timestamp()
@@ -0,0 +1,186 @@
+"""
+Persistent store of responses taught by the user.
+
+default_responses.json stays read-only. Every phrase -> response pair the
+user teaches is appended as one JSON line to learned_responses.jsonl; the
+file is flushed on every write and fsynced in batches (every sync_every
+entries, or sync_interval seconds after the first unsynced one), so most
+teach() calls cost one buffered write. On start-up the defaults are
+loaded, then the snapshot of earlier learning, then the log is replayed
+over both.
+
+Once the log holds compact_after entries it is compacted in the
+background: the log is rotated to a side file under the lock, the learned
+pairs are written to a new snapshot, and the side file is deleted. Replay
+is idempotent (later lines win), so a crash at any point of a compaction
+only means the side file is replayed again on the next start.
+
+    store = ResponseStore()
+    store.respond("what is the time")
+    store.teach("who is my doctor", "Your doctor is Dr. Sharma.")
+"""
+import json
+import os
+import threading
+import time
+
+from intents import RESPONSES_PATH, IntentIndex
+
+LOG_PATH = "learned_responses.jsonl"
+SNAPSHOT_PATH = "learned_responses.json"
+
+
+class ResponseStore:
+    """
+    :param sync_every: Unsynced entries that trigger an fsync.
+    :param sync_interval: Longest time in seconds an entry stays unsynced.
+    :param compact_after: Log entries that trigger a background compaction.
+    """
+
+    def __init__(self, defaults_path=RESPONSES_PATH, log_path=LOG_PATH, snapshot_path=SNAPSHOT_PATH,
+                 sync_every=32, sync_interval=1.0, compact_after=1000, min_score=0.5):
+        self.log_path = log_path
+        self.rotated_path = log_path + ".compacting"
+        self.snapshot_path = snapshot_path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_after = compact_after
+
+        with open(defaults_path, "r") as f:
+            responses = json.load(f)
+        self.learned = {}
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "r") as f:
+                self.learned.update(json.load(f))
+        # A side file left by an interrupted compaction is older than the log
+        self.log_entries = 0
+        for path in (self.rotated_path, log_path):
+            self.log_entries += _replay(path, self.learned)
+        if os.path.exists(self.rotated_path):
+            self._write_snapshot(dict(self.learned))
+        responses.update(self.learned)
+        self.index = IntentIndex(responses, min_score=min_score)
+
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._compactor = None
+        self._log = open(log_path, "a", encoding="utf-8")
+        self._syncer = threading.Thread(target=self._sync_loop, daemon=True)
+        self._syncer.start()
+        if self.log_entries >= compact_after:
+            self.compact()
+
+    def respond(self, text, values=None, now=None):
+        return self.index.respond(text, values, now)
+
+    def match(self, text):
+        return self.index.match(text)
+
+    def exact_match(self, text):
+        return self.index.exact_match(text)
+
+    def teach(self, phrase, response):
+        """Remember a response; returns once the entry is written (not necessarily synced)."""
+        line = json.dumps({"phrase": phrase, "response": response}, ensure_ascii=False)
+        with self._lock:
+            if self._closed:
+                raise ValueError("ResponseStore is closed.")
+            self._log.write(line + "\n")
+            self._log.flush()
+            self.learned[phrase] = response
+            self.index.add(phrase, response)
+            self.log_entries += 1
+            self._unsynced += 1
+            if self._unsynced == 1 or self._unsynced >= self.sync_every:
+                self._wake.notify()
+            compact = self.log_entries >= self.compact_after
+        if compact:
+            self.compact()
+
+    def sync(self):
+        """fsync everything taught so far."""
+        with self._lock:
+            self._sync()
+
+    def compact(self):
+        """Start a background compaction unless one is running; returns the thread or None."""
+        with self._lock:
+            if self._closed or (self._compactor is not None and self._compactor.is_alive()):
+                return None
+            self._sync()
+            self._log.close()
+            os.replace(self.log_path, self.rotated_path)
+            self._log = open(self.log_path, "a", encoding="utf-8")
+            self.log_entries = 0
+            learned = dict(self.learned)
+            self._compactor = threading.Thread(target=self._write_snapshot, args=(learned,), daemon=True)
+            self._compactor.start()
+            return self._compactor
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._sync()
+            self._log.close()
+            self._wake.notify()
+        if self._compactor is not None:
+            self._compactor.join()
+        self._syncer.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _sync(self):
+        # Caller holds the lock
+        if self._unsynced:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    def _sync_loop(self):
+        with self._lock:
+            while not self._closed:
+                if not self._unsynced:
+                    self._wake.wait()
+                    continue
+                # Give a burst of teaching sync_interval seconds to share one fsync
+                deadline = time.monotonic() + self.sync_interval
+                while not self._closed and self._unsynced < self.sync_every:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake.wait(remaining)
+                if not self._closed:
+                    self._sync()
+
+    def _write_snapshot(self, learned):
+        temporary = self.snapshot_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(learned, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.snapshot_path)
+        os.remove(self.rotated_path)
+
+
+def _replay(path, learned):
+    """Apply a log to learned; returns the number of entries. A torn last line is skipped."""
+    if not os.path.exists(path):
+        return 0
+    entries = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            learned[entry["phrase"]] = entry["response"]
+            entries += 1
+    return entries
@@ -0,0 +1,237 @@
+"""
+Road graph and route planning for the navigation assistant.
+
+Roads are read from a CSV of edges (start, end, km, road; see roads.csv)
+and treated as two-way. Shortest paths use A* with the ALT lower bound:
+distances from a few landmark nodes are precomputed once with Dijkstra,
+and by the triangle inequality |d(L, target) - d(L, v)| never
+overestimates the distance left from v, so the search heads for the
+target instead of growing a circle around the start. The landmark table
+is saved next to the CSV (roads.csv.landmarks.npz) and reused while the
+CSV is unchanged, and answered routes are kept in a small LRU cache.
+
+    graph = RoadGraph.load()
+    graph.directions("niwai", "delhi")
+    # ["Start from Niwai.", "Take NH52 towards Tonk Road for about 60 kilometers.", ...]
+"""
+import csv
+import heapq
+import math
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from intents import IntentIndex
+
+ROADS_PATH = "roads.csv"
+
+
+class Route:
+    """A path through the graph: node names, and the road and length of each leg."""
+
+    __slots__ = ("nodes", "roads", "lengths", "distance")
+
+    def __init__(self, nodes, roads, lengths):
+        self.nodes = nodes
+        self.roads = roads
+        self.lengths = lengths
+        self.distance = sum(lengths)
+
+    def legs(self):
+        """Consecutive edges on the same road merged: (road, end node, km) tuples."""
+        legs = []
+        for road, end, length in zip(self.roads, self.nodes[1:], self.lengths):
+            if legs and legs[-1][0] == road:
+                legs[-1] = (road, end, legs[-1][2] + length)
+            else:
+                legs.append((road, end, length))
+        return legs
+
+    def steps(self):
+        """The route as sentences to speak."""
+        steps = [f"Start from {self.nodes[0].title()}."]
+        for i, (road, end, length) in enumerate(self.legs()):
+            verb = "Take" if i == 0 else "Then take"
+            # Places named after their road (Tonk Road) need no "towards"
+            towards = "" if end == road.lower() else f" towards {end.title()}"
+            steps.append(f"{verb} {road}{towards} for about {length:.0f} kilometers.")
+        steps.append(f"You have arrived in {self.nodes[-1].title()}.")
+        return steps
+
+
+class RoadGraph:
+    """
+    :param names: Node names, indexed by node id.
+    :param edges: (start id, end id, km, road name) tuples; every road is two-way.
+    :param landmarks: Number of ALT landmarks; 0 turns A* into plain Dijkstra.
+    :param landmark_table: Precomputed (landmark ids, distance rows) to use instead of running Dijkstra.
+    """
+
+    def __init__(self, names, edges, landmarks=8, cache_size=1024, landmark_table=None):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.adjacency = [[] for _ in self.names]
+        for start, end, length, road in edges:
+            self.adjacency[start].append((end, length, road))
+            self.adjacency[end].append((start, length, road))
+        self.cache_size = cache_size
+        self._routes = OrderedDict()
+        self._lookup = None
+        self.last_settled = 0
+        if landmark_table is None:
+            landmark_table = self.choose_landmarks(min(landmarks, len(self.names)))
+        self.landmarks, rows = landmark_table
+        # Python lists: the heuristic reads single entries, which is faster than indexing numpy
+        self._landmark_rows = [np.asarray(row, dtype=np.float64).tolist() for row in rows]
+
+    @classmethod
+    def load(cls, path=ROADS_PATH, landmarks=8, cache=True, **kwargs):
+        """Read an edge CSV, reusing a saved landmark table when it matches the file."""
+        names, ids, edges = [], {}, []
+        with open(path, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                start, end = (ids.setdefault(name, len(ids)) for name in (row["start"].strip().lower(),
+                                                                            row["end"].strip().lower()))
+                edges.append((start, end, float(row["km"]), row["road"].strip()))
+        names = sorted(ids, key=ids.get)
+
+        cache_path = path + ".landmarks.npz"
+        stat = os.stat(path)
+        signature = np.array([stat.st_size, stat.st_mtime_ns, landmarks], dtype=np.int64)
+        table = None
+        if cache and os.path.exists(cache_path):
+            saved = np.load(cache_path)
+            if np.array_equal(saved["signature"], signature):
+                table = (saved["landmarks"].tolist(), saved["distances"])
+        graph = cls(names, edges, landmarks, landmark_table=table, **kwargs)
+        if cache and table is None:
+            np.savez(cache_path, signature=signature, landmarks=np.array(graph.landmarks, dtype=np.int64),
+                     distances=np.array(graph._landmark_rows, dtype=np.float64).reshape(len(graph.landmarks), len(names)))
+        return graph
+
+    def choose_landmarks(self, count):
+        """
+        Farthest-first landmarks: each new one is the node farthest from those already chosen.
+        :return: (landmark ids, distance rows).
+        """
+        if count == 0:
+            return [], []
+        landmarks, rows = [], []
+        nearest = np.full(len(self.names), np.inf)
+        start = np.array(self.distances_from(0))
+        candidate = int(np.argmax(np.where(np.isfinite(start), start, -1)))
+        for _ in range(count):
+            landmarks.append(candidate)
+            row = np.array(self.distances_from(candidate))
+            rows.append(row)
+            # Nodes unreachable from a landmark stay out of the running
+            np.minimum(nearest, np.where(np.isfinite(row), row, -np.inf), out=nearest)
+            candidate = int(np.argmax(nearest))
+            if nearest[candidate] <= 0:
+                break
+        return landmarks, rows
+
+    def distances_from(self, source):
+        """Dijkstra from one node; math.inf for unreachable nodes."""
+        distances = [math.inf] * len(self.names)
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        adjacency = self.adjacency
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for neighbor, length, _ in adjacency[node]:
+                candidate = distance + length
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return distances
+
+    def find(self, text):
+        """Node name for a spoken place name: exact first, then the closest name."""
+        name = " ".join(text.lower().split())
+        if name in self.ids:
+            return name
+        if self._lookup is None:
+            self._lookup = IntentIndex({name: name for name in self.names})
+        match, _ = self._lookup.match(name)
+        return match
+
+    def shortest_path(self, start, destination, active_landmarks=4):
+        """
+        :param start: Node name or id.
+        :param destination: Node name or id.
+        :param active_landmarks: Landmarks consulted per query, those giving the tightest bound at the start.
+        :return: Route, or None when the destination cannot be reached.
+        """
+        source = self.ids[start] if isinstance(start, str) else start
+        target = self.ids[destination] if isinstance(destination, str) else destination
+        key = (source, target)
+        if key in self._routes:
+            self._routes.move_to_end(key)
+            return self._routes[key]
+
+        route = self._search(source, target, active_landmarks)
+        self._routes[key] = route
+        if len(self._routes) > self.cache_size:
+            self._routes.popitem(last=False)
+        return route
+
+    def directions(self, start, destination):
+        """Spoken steps between two place names, or None if either is unknown or unreachable."""
+        start, destination = self.find(start), self.find(destination)
+        if start is None or destination is None:
+            return None
+        if start == destination:
+            return [f"You are already in {start.title()}."]
+        route = self.shortest_path(start, destination)
+        return route.steps() if route else None
+
+    def _search(self, source, target, active_landmarks):
+        bounds = []
+        for row in self._landmark_rows:
+            if math.isfinite(row[target]) and math.isfinite(row[source]):
+                bounds.append((abs(row[target] - row[source]), row, row[target]))
+        bounds.sort(key=lambda bound: bound[0], reverse=True)
+        bounds = [(row, to_target) for _, row, to_target in bounds[:active_landmarks]]
+
+        def heuristic(node):
+            best = 0.0
+            for row, to_target in bounds:
+                estimate = abs(to_target - row[node])
+                if estimate > best:
+                    best = estimate
+            return best
+
+        distances = {source: 0.0}
+        parents = {source: None}
+        settled = set()
+        heap = [(heuristic(source), 0.0, source)]
+        adjacency = self.adjacency
+        while heap:
+            _, distance, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            if node == target:
+                break
+            settled.add(node)
+            for neighbor, length, road in adjacency[node]:
+                candidate = distance + length
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    parents[neighbor] = (node, road, length)
+                    heapq.heappush(heap, (candidate + heuristic(neighbor), candidate, neighbor))
+        self.last_settled = len(settled)
+        if target not in parents:
+            return None
+
+        nodes, roads, lengths = [target], [], []
+        while parents[nodes[-1]] is not None:
+            node, road, length = parents[nodes[-1]]
+            nodes.append(node)
+            roads.append(road)
+            lengths.append(length)
+        names = self.names
+        return Route([names[node] for node in reversed(nodes)], roads[::-1], lengths[::-1])
@@ -0,0 +1,204 @@
+import heapq
+import itertools
+import threading
+
+import pyttsx3
+
+import metrics
+
+# Priorities, lowest value is spoken first
+URGENT = 0
+HIGH = 1
+NORMAL = 2
+LOW = 3
+
+
+class Utterance:
+    """A phrase waiting in, or taken from, the speech queue."""
+
+    def __init__(self, text, priority, key):
+        self.text = text
+        self.priority = priority
+        self.key = key
+        self.cancelled = False
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+        self.done.set()
+
+
+class SpeechService:
+    """
+    Speaks queued phrases on a dedicated thread so callers never block on TTS.
+
+    Pending phrases are ordered by priority, identical pending phrases are
+    spoken only once, and a phrase submitted with a key replaces any pending
+    phrase with the same key (so "person on your left" is superseded by the
+    newest position instead of piling up). URGENT phrases interrupt whatever
+    is being spoken at a lower priority.
+    """
+
+    def __init__(self, rate=None, volume=None):
+        self.rate = rate
+        self.volume = volume
+        self._heap = []
+        self._counter = itertools.count()
+        self._by_text = {}
+        self._by_key = {}
+        self._cond = threading.Condition()
+        self._current = None
+        self._preempt = threading.Event()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            for _, _, utterance in self._heap:
+                utterance.cancel()
+            self._heap.clear()
+            self._by_text.clear()
+            self._by_key.clear()
+            self._cond.notify_all()
+        self._preempt.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def say(self, text, priority=NORMAL, key=None, wait=False):
+        """
+        Queue a phrase and return immediately unless wait is set.
+        :param text: Phrase to speak.
+        :param priority: URGENT, HIGH, NORMAL or LOW.
+        :param key: Optional topic; a newer phrase with the same key replaces a pending one.
+        :param wait: Block until the phrase has been spoken or dropped.
+        :return: The queued Utterance.
+        """
+        if not self._running:
+            self.start()
+        with self._cond:
+            utterance = self._by_text.get(text)
+            if utterance is not None and utterance.priority <= priority:
+                # Identical phrase already pending
+                pass
+            else:
+                if utterance is not None:
+                    self._discard(utterance)
+                if key is not None and key in self._by_key:
+                    self._discard(self._by_key[key])
+                utterance = Utterance(text, priority, key)
+                heapq.heappush(self._heap, (priority, next(self._counter), utterance))
+                self._by_text[text] = utterance
+                if key is not None:
+                    self._by_key[key] = utterance
+                if self._current is not None and priority == URGENT and self._current.priority > URGENT:
+                    self._preempt.set()
+                self._cond.notify()
+        if wait:
+            utterance.done.wait()
+        return utterance
+
+    def pending(self):
+        with self._cond:
+            return len(self._by_text)
+
+    def _discard(self, utterance):
+        utterance.cancel()
+        self._by_text.pop(utterance.text, None)
+        if utterance.key is not None and self._by_key.get(utterance.key) is utterance:
+            del self._by_key[utterance.key]
+
+    def _next(self):
+        with self._cond:
+            while self._running:
+                while self._heap:
+                    _, _, utterance = heapq.heappop(self._heap)
+                    if utterance.cancelled:
+                        continue
+                    self._by_text.pop(utterance.text, None)
+                    if utterance.key is not None and self._by_key.get(utterance.key) is utterance:
+                        del self._by_key[utterance.key]
+                    # Cleared before _current is set, so an URGENT phrase queued from here on still preempts
+                    self._preempt.clear()
+                    self._current = utterance
+                    return utterance
+                self._cond.wait()
+            return None
+
+    def _on_word(self, name, location, length):
+        if self._preempt.is_set():
+            self._engine.stop()
+
+    def _run(self):
+        try:
+            self._speak_queue()
+        except Exception as e:
+            print(f"Speech service stopped: {e!r}")
+            # Release every waiting caller; the next say() starts a fresh engine
+            with self._cond:
+                self._running = False
+                if self._current is not None:
+                    self._current.cancel()
+                    self._current = None
+                for _, _, utterance in self._heap:
+                    utterance.cancel()
+                self._heap.clear()
+                self._by_text.clear()
+                self._by_key.clear()
+
+    def _speak_queue(self):
+        # pyttsx3 engines must be driven from the thread that created them
+        self._engine = pyttsx3.init()
+        if self.rate is not None:
+            self._engine.setProperty("rate", self.rate)
+        if self.volume is not None:
+            self._engine.setProperty("volume", self.volume)
+        self._engine.connect("started-word", self._on_word)
+
+        while True:
+            utterance = self._next()
+            if utterance is None:
+                break
+            with metrics.timer("tts"):
+                self._engine.say(utterance.text)
+                self._engine.runAndWait()
+            with self._cond:
+                self._current = None
+            utterance.done.set()
+        self._engine.stop()
+
+
+_service = None
+_service_lock = threading.Lock()
+_muted = False
+
+
+def get_service(rate=None, volume=None):
+    """Return the process-wide speech service, starting it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SpeechService(rate=rate, volume=volume).start()
+        return _service
+
+
+def mute(muted=True):
+    """Silence say() process-wide, e.g. for headless runs and benchmarks."""
+    global _muted
+    _muted = muted
+
+
+def say(text, priority=NORMAL, key=None, wait=False):
+    """Queue a phrase on the shared speech service; does nothing while muted."""
+    if _muted:
+        return None
+    return get_service().say(text, priority=priority, key=key, wait=wait)
@@ -0,0 +1,127 @@
+"""Tests for the reminder scheduler, driven by a fake clock."""
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from reminder_store import ReminderStore
+from reminders import ReminderScheduler
+
+START = datetime(2026, 10, 18, 8, 0)
+
+
+class FakeClock:
+    def __init__(self, start=START):
+        self.now = start.timestamp()
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs).total_seconds()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fired():
+    return []
+
+
+def test_reminders_in_the_same_minute_all_fire(clock, fired):
+    scheduler = ReminderScheduler(fired.append, clock=clock)
+    scheduler.at("medicine", 9, 0)
+    scheduler.at("water plants", 9, 0)
+
+    clock.advance(hours=1)
+    scheduler.run_pending()
+
+    assert sorted(reminder.task for reminder in fired) == ["medicine", "water plants"]
+    assert scheduler.pending() == []
+
+
+def test_skipped_minute_boundary_still_fires(clock, fired):
+    scheduler = ReminderScheduler(fired.append, clock=clock)
+    scheduler.at("call home", 8, 30)
+
+    clock.advance(minutes=29)
+    assert scheduler.run_pending() == []
+    # The scheduler did not look at 08:30 at all; the reminder is late, not lost
+    clock.advance(minutes=7)
+    assert [reminder.task for reminder in scheduler.run_pending()] == ["call home"]
+
+
+def test_daily_reminder_is_requeued_for_the_next_day(clock, fired):
+    scheduler = ReminderScheduler(fired.append, clock=clock)
+    scheduler.at("walk", 9, 0, daily=True)
+
+    clock.advance(hours=1)
+    assert [reminder.task for reminder in scheduler.run_pending()] == ["walk"]
+    (repeat,) = scheduler.pending()
+    assert repeat.daily
+    assert repeat.when == datetime(2026, 10, 19, 9, 0).timestamp()
+
+    # Several missed days fire once and move on to the next future occurrence
+    clock.advance(days=3)
+    assert len(scheduler.run_pending()) == 1
+    assert scheduler.next_due() == datetime(2026, 10, 22, 9, 0).timestamp()
+
+
+def test_cancelled_reminder_does_not_fire(clock, fired):
+    scheduler = ReminderScheduler(fired.append, clock=clock)
+    kept = scheduler.at("kept", 9, 0)
+    dropped = scheduler.at("dropped", 8, 30)
+    scheduler.cancel(dropped)
+
+    assert scheduler.pending() == [kept]
+    clock.advance(hours=2)
+    scheduler.run_pending()
+    assert fired == [kept]
+
+
+def test_earlier_reminder_wakes_the_thread(clock):
+    done = threading.Event()
+    scheduler = ReminderScheduler(lambda reminder: done.set(), clock=clock)
+    scheduler.add("far away", clock() + 3600)
+    scheduler.start()
+    try:
+        # The thread is sleeping for an hour; only the notify on add can make this fire in time
+        scheduler.add("now", clock())
+        assert done.wait(2.0)
+    finally:
+        scheduler.stop()
+
+
+def test_store_fires_missed_reminders_at_startup(tmp_path, clock, fired):
+    path = str(tmp_path / "reminders.db")
+    with ReminderStore(path) as store:
+        scheduler = ReminderScheduler(fired.append, clock=clock, store=store)
+        scheduler.at("once", 9, 0)
+        daily = scheduler.at("daily", 10, 0, daily=True)
+
+    # The assistant was not running through both reminders
+    clock.advance(hours=5)
+    with ReminderStore(path) as store:
+        scheduler = ReminderScheduler(fired.append, clock=clock, store=store)
+        assert [reminder.task for reminder in scheduler.run_pending()] == ["once", "daily"]
+
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute("SELECT id, task, fire_at, done FROM reminders ORDER BY id").fetchall()
+    assert rows[0][1:] == ("once", datetime(2026, 10, 18, 9, 0).timestamp(), 1)
+    assert rows[1] == (daily.id, "daily", datetime(2026, 10, 19, 10, 0).timestamp(), 0)
+
+
+def test_store_keeps_only_upcoming_reminders_in_memory(tmp_path, clock, fired):
+    with ReminderStore(str(tmp_path / "reminders.db")) as store:
+        scheduler = ReminderScheduler(fired.append, clock=clock, store=store, horizon=3600)
+        scheduler.at("soon", 8, 30)
+        scheduler.at("tomorrow", 7, 0)
+        assert [reminder.task for _, _, reminder in scheduler._heap] == ["soon"]
+        assert [reminder.task for reminder in scheduler.pending()] == ["soon", "tomorrow"]
+
+        clock.advance(days=1)
+        assert [reminder.task for reminder in scheduler.run_pending()] == ["soon", "tomorrow"]
@@ -0,0 +1,125 @@
+import itertools
+
+import numpy as np
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU between two (N, 4) and (M, 4) arrays of x, y, w, h boxes."""
+    a = np.asarray(a, dtype=np.float32)[:, None, :]
+    b = np.asarray(b, dtype=np.float32)[None, :, :]
+    left = np.maximum(a[..., 0], b[..., 0])
+    top = np.maximum(a[..., 1], b[..., 1])
+    right = np.minimum(a[..., 0] + a[..., 2], b[..., 0] + b[..., 2])
+    bottom = np.minimum(a[..., 1] + a[..., 3], b[..., 1] + b[..., 3])
+    inter = np.clip(right - left, 0, None) * np.clip(bottom - top, 0, None)
+    union = a[..., 2] * a[..., 3] + b[..., 2] * b[..., 3] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+
+class Track:
+    """One tracked object with a constant-velocity box estimate."""
+
+    def __init__(self, track_id, box, confidence, class_id):
+        self.track_id = track_id
+        self.box = np.asarray(box, dtype=np.float32)
+        self.velocity = np.zeros(4, dtype=np.float32)
+        self.confidence = float(confidence)
+        self.class_id = int(class_id)
+        self.hits = 1
+        self.misses = 0
+        self.frames_since_update = 0
+
+    def predict(self):
+        self.box = self.box + self.velocity
+        self.frames_since_update += 1
+
+    def update(self, box, confidence, gain=0.5):
+        """Correct the predicted box with a matched detection (alpha-beta filter)."""
+        box = np.asarray(box, dtype=np.float32)
+        residual = box - self.box
+        self.velocity = self.velocity + gain * residual / max(self.frames_since_update, 1)
+        self.box = box
+        self.confidence = float(confidence)
+        self.hits += 1
+        self.misses = 0
+        self.frames_since_update = 0
+
+
+class ObjectTracker:
+    """
+    Carries NMS-kept detections forward between detector runs.
+
+    Call update() on frames where the detector ran and predict() on the
+    frames in between. Detections are matched to tracks of the same class
+    greedily by IoU; unmatched detections start new tracks with a stable ID
+    (listed in new_tracks until the next update) and tracks unmatched for
+    max_misses detector runs are dropped.
+
+    :param iou_threshold: Minimum IoU for a detection to continue a track.
+    :param max_misses: Detector runs a track may go unmatched before removal.
+    :param max_coast: Frames a track may be predicted without a detection
+        before the tracker stops reporting itself confident.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_misses=3, max_coast=30):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.max_coast = max_coast
+        self.tracks = []
+        self.new_tracks = []
+        self._ids = itertools.count(1)
+
+    def predict(self):
+        """Advance every track by one frame without a detection."""
+        for track in self.tracks:
+            track.predict()
+        self.new_tracks = []
+        return self.tracks
+
+    def update(self, boxes, confidences, class_ids):
+        """Match a detector result against the tracks; returns the live tracks."""
+        for track in self.tracks:
+            track.predict()
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        class_ids = np.asarray(class_ids).reshape(-1)
+
+        matched_tracks, matched_dets = set(), set()
+        if self.tracks and len(boxes):
+            ious = iou_matrix([track.box for track in self.tracks], boxes)
+            same_class = np.array([track.class_id for track in self.tracks])[:, None] == class_ids[None, :]
+            ious = np.where(same_class, ious, 0.0)
+            for flat in np.argsort(ious, axis=None)[::-1]:
+                t, d = np.unravel_index(flat, ious.shape)
+                if ious[t, d] < self.iou_threshold:
+                    break
+                if t in matched_tracks or d in matched_dets:
+                    continue
+                self.tracks[t].update(boxes[d], confidences[d])
+                matched_tracks.add(t)
+                matched_dets.add(d)
+
+        survivors = []
+        for index, track in enumerate(self.tracks):
+            if index not in matched_tracks:
+                track.misses += 1
+            if track.misses <= self.max_misses:
+                survivors.append(track)
+        self.new_tracks = [Track(next(self._ids), boxes[d], confidences[d], class_ids[d])
+                           for d in range(len(boxes)) if d not in matched_dets]
+        self.tracks = survivors + self.new_tracks
+        return self.tracks
+
+    def confident(self):
+        """True while every track was matched by the last detection and has not coasted too long."""
+        return all(track.misses == 0 and track.frames_since_update <= self.max_coast for track in self.tracks)
+
+    def arrays(self):
+        """Current tracks as (boxes, confidences, class_ids, track_ids) with int x, y, w, h boxes."""
+        if not self.tracks:
+            return (np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32),
+                    np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        boxes = np.array([track.box for track in self.tracks]).astype(np.int32)
+        confidences = np.array([track.confidence for track in self.tracks], dtype=np.float32)
+        class_ids = np.array([track.class_id for track in self.tracks])
+        track_ids = np.array([track.track_id for track in self.tracks])
+        return boxes, confidences, class_ids, track_ids
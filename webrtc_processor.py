@@ -0,0 +1,66 @@
+"""
+Camera pipeline as a streamlit_webrtc video processor.
+
+Frames come from each visitor's browser instead of a server-side camera, so
+one Streamlit process can serve several users without blocking the script.
+recv_queued() receives every frame that arrived while the previous one was
+being processed and only runs the models on the newest, so a slow model
+drops frames instead of building up latency. YOLO, the expression model and
+the distance table are shared by all sessions through models.py; each
+session gets its own MediaPipe Pose and FaceMesh, which keep per-stream
+tracking state.
+"""
+import asyncio
+import threading
+
+import av
+from streamlit_webrtc import VideoProcessorBase
+
+import metrics
+import models
+from camera_app_pipeline import CameraAppPipeline
+
+
+class CameraVideoProcessor(VideoProcessorBase):
+    """
+    :param input_size: YOLO input resolution.
+    :param overlay: Draw per-stage milliseconds on the returned video.
+    """
+
+    def __init__(self, input_size=416, overlay=False):
+        self.pipeline = CameraAppPipeline(input_size=input_size, pose=models.load_pose(),
+                                          face_mesh=models.load_face_mesh(), speak=False)
+        self.overlay = overlay
+        self.frames_in = 0
+        self.frames_processed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def last_announcement(self):
+        """Latest "person 2 m ahead on your left" text, for the page to show or speak."""
+        return self.pipeline.last_announcement
+
+    def process(self, image):
+        with self._lock:
+            self.pipeline.process(image)
+            if self.overlay:
+                metrics.draw_overlay(image)
+        return image
+
+    async def recv_queued(self, frames):
+        # Everything but the newest frame is already stale; skip it
+        frame = frames[-1]
+        self.frames_in += len(frames)
+        self.frames_processed += 1
+        image = frame.to_ndarray(format="bgr24")
+        # Inference runs on a worker thread so the session's event loop keeps receiving frames
+        image = await asyncio.get_running_loop().run_in_executor(None, self.process, image)
+        result = av.VideoFrame.from_ndarray(image, format="bgr24")
+        result.pts = frame.pts
+        result.time_base = frame.time_base
+        return [result]
+
+
+def processor_factory(input_size=416, overlay=False):
+    """video_processor_factory for webrtc_streamer."""
+    return lambda: CameraVideoProcessor(input_size=input_size, overlay=overlay)